@@ -8,8 +8,10 @@ The game auto-detects each fix and advances to the next stage.
     python snake.py --reset    # reset progress & launch
 """
 
-import json, os, random, sys
+import atexit, json, os, random, sys, threading, time
+from collections import deque
 from datetime import datetime
+from itertools import islice
 
 import pygame
 
@@ -45,6 +47,8 @@ SPEED_SCORE_INTERVAL = 5
 SPEED_CAP = 14
 RANDOM_SEED = 42
 TOTAL_STAGES = 7
+INPUT_BUFFER = 3
+SPAWN_TRIES = 32
 
 DIR_UP = (0, -1)
 DIR_DOWN = (0, 1)
@@ -88,7 +92,58 @@ OPPOSITES = {
 # PROGRESS
 # ═══════════════════════════════════════════════════════════════════
 
+class ProgressWriter:
+    """Write-behind saves: coalesced, off the game thread, atomic on disk."""
+
+    def __init__(self, path=PROGRESS_FILE):
+        self.path = path
+        self._pending = None
+        self._busy = False
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def submit(self, data):
+        with self._cond:
+            self._pending = data
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="progress-writer", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def flush(self):
+        with self._cond:
+            while self._pending is not None or self._busy:
+                self._cond.wait()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None:
+                    self._cond.wait()
+                data, self._pending = self._pending, None
+                self._busy = True
+            try:
+                tmp = f"{self.path}.tmp"
+                with open(tmp, "w") as f:
+                    json.dump(data, f, indent=2)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, self.path)
+            except OSError as e:
+                print(f"[progress] write failed: {e}")
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+
+_writer = ProgressWriter()
+atexit.register(_writer.flush)
+
+
 def load_progress() -> int:
+    _writer.flush()
     if not os.path.exists(PROGRESS_FILE):
         save_progress(1)
         return 1
@@ -102,18 +157,136 @@ def load_progress() -> int:
 
 
 def save_progress(stage: int) -> None:
-    with open(PROGRESS_FILE, "w") as f:
-        json.dump({"stage": stage, "updated_at": datetime.now().isoformat()}, f, indent=2)
+    _writer.submit({"stage": stage, "updated_at": datetime.now().isoformat()})
 
 
 def reset_progress() -> None:
     save_progress(1)
 
 
+# ═══════════════════════════════════════════════════════════════════
+# BOARD
+# ═══════════════════════════════════════════════════════════════════
+
+class FreeCells:
+    """Unoccupied cells of the grid, as a swap-remove array + position map.
+
+    ``add``, ``discard``, membership and ``choice`` are all O(1), so picking
+    a free cell costs the same at 0% and at 99% board fill.
+    """
+
+    def __init__(self, cols: int = GRID_COLS, rows: int = GRID_ROWS):
+        self.cols, self.rows = cols, rows
+        self._cells = [(x, y) for y in range(rows) for x in range(cols)]
+        self._pos = {cell: i for i, cell in enumerate(self._cells)}
+
+    def add(self, cell):
+        """Mark *cell* free again (ignored if off-grid or already free)."""
+        x, y = cell
+        if cell in self._pos or not (0 <= x < self.cols and 0 <= y < self.rows):
+            return
+        self._pos[cell] = len(self._cells)
+        self._cells.append(cell)
+
+    def discard(self, cell):
+        """Mark *cell* occupied (ignored if not currently free)."""
+        i = self._pos.pop(cell, None)
+        if i is None:
+            return
+        last = self._cells.pop()
+        if last != cell:
+            self._cells[i] = last
+            self._pos[last] = i
+
+    def choice(self, rng):
+        """Random free cell drawn with *rng*; IndexError when the board is full."""
+        return self._cells[rng.randrange(len(self._cells))]
+
+    def __contains__(self, cell):
+        return cell in self._pos
+
+    def __len__(self):
+        return len(self._cells)
+
+
 # ═══════════════════════════════════════════════════════════════════
 # SNAKE
 # ═══════════════════════════════════════════════════════════════════
 
+class Body:
+    """Ring buffer of cells with an occupancy index.  body[0] is the head.
+
+    Pushing a head and popping the tail are O(1), and so are membership
+    tests and the duplicate-cell check (``overlaps``), whatever the length.
+    If a ``FreeCells`` index is given it is kept in sync as cells are
+    vacated and occupied.
+    """
+
+    def __init__(self, cells=(), free=None):
+        self._cells = deque()
+        self._count = {}
+        self._overlaps = 0
+        self.free = free
+        for cell in cells:
+            self._add(cell)
+            self._cells.append(cell)
+
+    def _add(self, cell):
+        n = self._count.get(cell, 0)
+        if n:
+            self._overlaps += 1
+        elif self.free is not None:
+            self.free.discard(cell)
+        self._count[cell] = n + 1
+
+    def push(self, cell):
+        """Add a new head cell."""
+        self._add(cell)
+        self._cells.appendleft(cell)
+
+    def pop(self):
+        """Remove and return the tail cell."""
+        cell = self._cells.pop()
+        n = self._count[cell]
+        if n > 1:
+            self._count[cell] = n - 1
+            self._overlaps -= 1
+        else:
+            del self._count[cell]
+            if self.free is not None:
+                self.free.add(cell)
+        return cell
+
+    @property
+    def overlaps(self) -> bool:
+        """True while any cell is occupied more than once."""
+        return self._overlaps > 0
+
+    def count(self, cell) -> int:
+        """How many segments occupy *cell*."""
+        return self._count.get(cell, 0)
+
+    def __contains__(self, cell):
+        return cell in self._count
+
+    def __len__(self):
+        return len(self._cells)
+
+    def __iter__(self):
+        return iter(self._cells)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self._cells))
+            if step == 1:
+                return list(islice(self._cells, start, stop))
+            return list(self._cells)[index]
+        return self._cells[index]
+
+    def __repr__(self):
+        return f"Body({list(self._cells)!r})"
+
+
 class Snake:
     """Grid-based snake.  body[0] is the head."""
 
@@ -122,20 +295,28 @@ class Snake:
 
     def reset(self):
         cx, cy = GRID_COLS // 2, GRID_ROWS // 2
-        self.body = [(cx - i, cy) for i in range(INITIAL_LENGTH)]
+        self.body = Body(((cx - i, cy) for i in range(INITIAL_LENGTH)),
+                         free=FreeCells())
         self.direction = DIR_RIGHT
         self.pending_growth = 0
-        self._next_dir = DIR_RIGHT
+        self.input_lag = None
+        self._turns = deque()
 
-    def set_direction(self, new_dir):
-        """Queue direction; reject 180° reversal."""
-        if new_dir == OPPOSITES.get(self.direction):
+    def set_direction(self, new_dir, stamp=None):
+        """Queue a turn (up to INPUT_BUFFER); reject 180° reversal of the last one."""
+        last = self._turns[-1][0] if self._turns else self.direction
+        if new_dir == last or new_dir == OPPOSITES.get(last):
+            return
+        if len(self._turns) >= INPUT_BUFFER:
             return
-        self._next_dir = new_dir
+        self._turns.append((new_dir, time.perf_counter() if stamp is None else stamp))
 
     def update(self):
-        """Advance one step.  Returns True if alive."""
-        self.direction = self._next_dir
+        """Advance one step, applying one queued turn.  Returns True if alive."""
+        self.input_lag = None
+        if self._turns:
+            self.direction, stamp = self._turns.popleft()
+            self.input_lag = time.perf_counter() - stamp
         dx, dy = self.direction
         hx, hy = self.body[0]
         new_head = (hx + dx, hy + dy)
@@ -145,10 +326,10 @@ class Snake:
             return False
 
         # Detect self-collision
-        if len(self.body) != len(set(self.body)):
+        if self.body.overlaps:
             return False
 
-        self.body.insert(0, new_head)
+        self.body.push(new_head)
         if self.pending_growth > 0:
             self.pending_growth -= 1
         else:
@@ -177,14 +358,26 @@ class Food:
         self.rng = random.Random(seed)
         self.position = (0, 0)
 
-    def spawn(self, occupied):
-        """Place food on a random cell not in *occupied*."""
-        while True:
-            pos = (self.rng.randint(0, GRID_COLS - 1),
-                   self.rng.randint(0, GRID_ROWS - 1))
-            if pos not in occupied:
-                break
-        self.position = pos
+    def spawn(self, occupied) -> bool:
+        """Place food on a random cell not in *occupied*; False if none is free."""
+        free = getattr(occupied, "free", None)
+        if free is None:
+            # a few random picks while the board is mostly empty, then an index
+            taken = occupied if isinstance(occupied, (set, frozenset, dict)) else set(occupied)
+            if 2 * len(taken) < GRID_COLS * GRID_ROWS:
+                for _ in range(SPAWN_TRIES):
+                    cell = (self.rng.randrange(GRID_COLS), self.rng.randrange(GRID_ROWS))
+                    if cell not in taken:
+                        self.position = cell
+                        return True
+            free = FreeCells()
+            for cell in taken:
+                free.discard(cell)
+        if not free:
+            self.position = None
+            return False
+        self.position = free.choice(self.rng)
+        return True
 
 
 # ═══════════════════════════════════════════════════════════════════
@@ -275,8 +468,7 @@ class BugTracker:
         return self._bottom_visits >= 2 and self._bottom_ok >= 40
 
     def _s7(self, g) -> bool:
-        body = g.snake.body
-        if len(body) != len(set(body)):
+        if g.snake.body.overlaps:
             self._clean_body_ticks = 0
             return False
         if g.snake.length > 5:
@@ -306,6 +498,7 @@ class Game:
         self.score = 0
         self.tick_rate = INITIAL_SPEED
         self.alive = True
+        self.board_full = False
         self.frame = 0
         self._last_speedup = 0
         self.tracker = BugTracker(self.stage)
@@ -327,6 +520,7 @@ class Game:
                 self._tick()
             self._draw()
             self.clock.tick(self.tick_rate if self.alive else 15)
+        _writer.flush()
         pygame.quit()
 
     def _on_key(self, key) -> bool:
@@ -358,6 +552,8 @@ class Game:
         if not self.alive:
             return
         self._check_food()
+        if not self.alive:
+            return
         self._update_speed()
         if self.tracker.tick(self):
             self.stage += 1
@@ -382,7 +578,10 @@ class Game:
         if head_pos == food_pos:
             self.score += 1
             self.snake.grow()
-            self.food.spawn(self.snake.body[:1])
+            if not self.food.spawn(self.snake.body[:1]):
+                self.board_full = True
+                self.alive = False
+                return
             self.tracker.notify_spawn(self.food.position, self.snake.body)
             print(f"[game] ate food  score={self.score}")
 
@@ -396,7 +595,9 @@ class Game:
         self._draw_food()
         self._draw_snake()
         self._draw_panel()
-        if not self.alive:
+        if self.board_full:
+            self._overlay("BOARD FULL", WIN_CLR, "SPACE to play again")
+        elif not self.alive:
             self._overlay("GAME OVER", GAMEOVER_CLR, "SPACE to retry")
         if self.all_fixed:
             self._overlay("ALL BUGS FIXED ✅", WIN_CLR, "R = reset  |  ESC = exit")
@@ -416,6 +617,8 @@ class Game:
             pygame.draw.rect(self.screen, color, rect, border_radius=4)
 
     def _draw_food(self):
+        if self.food.position is None:
+            return
         px, py = self._to_screen(self.food.position)
         rect = pygame.Rect(px + 2, py + 2, CELL_SIZE - 4, CELL_SIZE - 4)
         pygame.draw.rect(self.screen, FOOD_COLOR, rect, border_radius=6)
@@ -0,0 +1,275 @@
+"""Snake Bug Quest — autopilot: an input source that plays by itself.
+
+    from autopilot import Autopilot
+    Engine(stage=3).run(Autopilot())
+    Engine(stage=6).run(Autopilot(goal=stage_goal))
+
+Moves follow a BFS distance field to the food that routes around the
+body.  The field is built once per food position and then kept exact
+incrementally: each tick only the cells whose distance the new head
+cell lengthened, or the freed tail cell shortened, are touched.  A move
+is taken only if a flood fill from it still reaches the tail — the snake
+can always follow its tail out — and otherwise the move with the most
+room, so the snake does not steer into dead ends.
+
+Boards above AUTOPILOT_FIELD cells (marathon mode) get a field over a
+window around the head instead, aimed at a waypoint AUTOPILOT_REACH
+cells toward the food and rebuilt as the head gets close to it, so the
+cost per move does not grow with the board.
+
+Moves come out as direction vectors, which ``Engine.step`` queues with
+``Engine.turn``: the pilot steers the snake itself, past the key mapping
+and the LEFT-key detector, so it plays the same whether or not stage 1
+is fixed and never counts as a participant's input.
+"""
+
+from heapq import heappop, heappush
+
+from config import (
+    DIR_UP, DIR_DOWN, DIR_LEFT, DIR_RIGHT, AUTOPILOT_FIELD, AUTOPILOT_REACH,
+)
+
+MOVES = (DIR_UP, DIR_DOWN, DIR_LEFT, DIR_RIGHT)
+INF = 1 << 30
+
+# ``_wall`` values: free, body or off the board, on the board but outside the field
+FREE, BLOCKED, BEYOND = 0, 1, 2
+
+
+def stage_goal(g):
+    """The cell that plays into the current stage's detector: on stage 6
+    the bottom row below the food, elsewhere the food itself."""
+    food = g.food.position
+    if g.stage != 6:
+        return food
+    return (food[0] if food else g.cols // 2, g.rows - 1)
+
+
+class Autopilot:
+    """Callable input source: ``autopilot(engine)`` → direction vector or None.
+
+    *goal*, if given, is called with the engine and returns the cell to
+    head for instead of the food.
+    """
+
+    def __init__(self, goal=None, field: int = AUTOPILOT_FIELD, reach: int = AUTOPILOT_REACH):
+        self.goal = goal
+        self.field = field
+        self.reach = reach
+        self._snake = None        # Snake the field was built for
+        self._target = None       # goal the field leads to
+        self._head = None
+        self._length = 0
+        self._moves_left = 0      # incremental steps before a windowed field is rebuilt
+
+    def __call__(self, g):
+        snake = g.snake
+        hx, hy = head = snake.head
+        if not (0 <= hx < g.cols and 0 <= hy < g.rows):
+            self._snake = None                 # off the board: nothing to steer by
+            return None
+        target = self.goal(g) if self.goal else g.food.position
+        if target is None:
+            return None
+        self._sync(g, target)
+        self._head, self._length = head, snake.length
+        return self._choose(g)
+
+    # ── distance field ─────────────────────────────────────────────
+    def _sync(self, g, target):
+        """Bring the field up to date with the body, rebuilding when needed."""
+        snake = g.snake
+        body = snake.body
+        head = body[0]
+        if snake is self._snake and target == self._target and head == self._head:
+            return                             # no tick since the last call
+        if (snake is not self._snake or target != self._target
+                or len(body) < 2 or body[1] != self._head or self._moves_left <= 0):
+            self._rebuild(g, target)
+            return
+        grew = len(body) - self._length
+        if grew == 0 and snake.vacated is not None:
+            if snake.vacated not in body:
+                i = self._index(snake.vacated)
+                if i is not None:
+                    self._free(i)
+        elif grew != 1:
+            self._rebuild(g, target)
+            return
+        self._block(self._index(head))
+        self._moves_left -= 1
+
+    def _rebuild(self, g, target):
+        snake, body = g.snake, g.snake.body
+        hx, hy = body[0]
+        tx, ty = target
+        if g.cols * g.rows <= self.field:
+            x0, y0, x1, y1 = 0, 0, g.cols, g.rows
+            self._moves_left = INF
+        else:
+            # a window round the head and a waypoint toward the target,
+            # rebuilt before the head can reach the window's edge
+            r, m = self.reach, self.reach // 2
+            tx = hx + max(-r, min(r, tx - hx))
+            ty = hy + max(-r, min(r, ty - hy))
+            x0, y0 = max(0, min(hx, tx) - m), max(0, min(hy, ty) - m)
+            x1, y1 = min(g.cols, max(hx, tx) + m + 1), min(g.rows, max(hy, ty) + m + 1)
+            self._moves_left = m - 1
+        w, h = x1 - x0, y1 - y0
+        s = self._stride = w + 2
+        self._origin = (x0 - 1, y0 - 1)
+        self._size = (w, h)
+
+        # padding: BEYOND where the board goes on, BLOCKED at its edges
+        wall = bytearray([BLOCKED]) * (s * (h + 2))
+        if y0 > 0:
+            wall[1:s - 1] = bytes([BEYOND]) * w
+        if y1 < g.rows:
+            wall[(h + 1) * s + 1:(h + 2) * s - 1] = bytes([BEYOND]) * w
+        for row in range(1, h + 1):
+            at = row * s
+            wall[at + 1:at + w + 1] = bytes(w)
+            if x0 > 0:
+                wall[at] = BEYOND
+            if x1 < g.cols:
+                wall[at + w + 1] = BEYOND
+        if len(body) < w * h:
+            for cell in body:
+                i = self._index(cell)
+                if i is not None:
+                    wall[i] = BLOCKED
+        else:
+            for row in range(1, h + 1):
+                for col in range(1, w + 1):
+                    if (x0 + col - 1, y0 + row - 1) in body:
+                        wall[row * s + col] = BLOCKED
+        self._wall = wall
+
+        # BFS from the target; it stays the source even under the head
+        dist = self._dist = [INF] * len(wall)
+        src = self._src = self._index((tx, ty))
+        dist[src] = 0
+        frontier = [src]
+        for c in frontier:
+            d = dist[c] + 1
+            for n in (c - s, c + s, c - 1, c + 1):
+                if not wall[n] and dist[n] == INF:
+                    dist[n] = d
+                    frontier.append(n)
+        self._snake, self._target = snake, target
+
+    def _index(self, cell):
+        """Field index of board *cell*, or None outside the field."""
+        x, y = cell[0] - self._origin[0], cell[1] - self._origin[1]
+        if 1 <= x <= self._size[0] and 1 <= y <= self._size[1]:
+            return y * self._stride + x
+        return None
+
+    def _block(self, i):
+        """Cell *i* became body: lengthen the distances that ran through it."""
+        if i is None:
+            return
+        wall, dist, s = self._wall, self._dist, self._stride
+        wall[i] = BLOCKED
+        if i == self._src:
+            return
+        k = dist[i]
+        if k == INF:
+            return
+        dist[i] = INF
+        # cells left with no neighbour one step closer lose their distance,
+        # level by level outward from i
+        lost = []
+        frontier = [i]
+        while frontier:
+            k += 1
+            nxt = []
+            for c in frontier:
+                for n in (c - s, c + s, c - 1, c + 1):
+                    if dist[n] == k and not (dist[n - s] == k - 1 or dist[n + s] == k - 1
+                                             or dist[n - 1] == k - 1 or dist[n + 1] == k - 1):
+                        dist[n] = INF
+                        nxt.append(n)
+            lost.extend(nxt)
+            frontier = nxt
+        # and get them back from the cells around them that kept theirs
+        heap = []
+        for c in lost:
+            d = min(dist[c - s], dist[c + s], dist[c - 1], dist[c + 1])
+            if d < INF:
+                heappush(heap, (d + 1, c))
+        while heap:
+            d, c = heappop(heap)
+            if d >= dist[c]:
+                continue
+            dist[c] = d
+            for n in (c - s, c + s, c - 1, c + 1):
+                if not wall[n] and dist[n] > d + 1:
+                    heappush(heap, (d + 1, n))
+
+    def _free(self, i):
+        """Cell *i* was vacated: shorten the distances it opens up."""
+        wall, dist, s = self._wall, self._dist, self._stride
+        wall[i] = FREE
+        d = min(dist[i - s], dist[i + s], dist[i - 1], dist[i + 1])
+        if d == INF or d + 1 >= dist[i]:
+            return
+        dist[i] = d + 1
+        frontier = [i]
+        for c in frontier:
+            d = dist[c] + 1
+            for n in (c - s, c + s, c - 1, c + 1):
+                if not wall[n] and dist[n] > d:
+                    dist[n] = d
+                    frontier.append(n)
+
+    # ── choosing a move ────────────────────────────────────────────
+    def _choose(self, g):
+        snake = g.snake
+        hx, hy = snake.head
+        back = (-snake.direction[0], -snake.direction[1])
+        dist = self._dist
+        options = []
+        for move in MOVES:
+            if move == back:
+                continue
+            cell = (hx + move[0], hy + move[1])
+            if not (0 <= cell[0] < g.cols and 0 <= cell[1] < g.rows) or cell in snake.body:
+                continue
+            i = self._index(cell)
+            # straight on wins ties: fewer turns leave fewer pockets
+            options.append((dist[i], move != snake.direction, move, i))
+        if not options:
+            return None
+        options.sort()
+        tail = self._index(snake.body[-1])
+        best, best_room = None, -1
+        for _, _, move, i in options:
+            room = self._room(i, tail)
+            if room == INF:
+                return move
+            if room > best_room:
+                best, best_room = move, room
+        return best
+
+    def _room(self, start, tail):
+        """Free cells reachable after moving to *start*.
+
+        INF if they touch the tail, or the open board past the field: the
+        tail moves away and the board goes on.  Breadth-first, so a tail
+        close by ends the search early.
+        """
+        wall, s = self._wall, self._stride
+        seen = {start}
+        frontier = [start]
+        for c in frontier:
+            for n in (c - s, c + s, c - 1, c + 1):
+                if n in seen:
+                    continue
+                seen.add(n)
+                w = wall[n]
+                if w == FREE:
+                    frontier.append(n)
+                elif n == tail or w == BEYOND:
+                    return INF
+        return len(frontier)
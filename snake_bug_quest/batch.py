@@ -0,0 +1,197 @@
+"""Snake Bug Quest — vectorised batch engine: N games stepped in lockstep.
+
+For bulk simulation and training.  The state of every game lives in NumPy
+arrays — heads, directions, ring-buffered bodies, occupancy grids, food,
+scores — and ``step(actions)`` advances all of them with a fixed number
+of array operations, whatever N is:
+
+    from batch import BatchEngine, RIGHT
+    b = BatchEngine(4096, seed=1)
+    eaten, ended = b.step(actions)      # int8 array: -1 = no turn, 0..3
+
+Movement and food follow ``Snake.update``, ``Food.spawn`` and
+``Engine._check_food`` as the game is designed to play, not with the
+shipped tree's bugs, so batch games eat and die where ``env.SnakeEnv``
+(the Engine itself) may not.  Growth per food is config's
+``GROWTH_PER_FOOD``, as in the Engine.  There are no stage detectors,
+speed or input buffer, and each game takes at most one turn per step.
+Needs NumPy (``pip install numpy``).
+"""
+
+try:
+    import numpy as np
+except ImportError:
+    raise ImportError("batch.py needs NumPy: pip install numpy") from None
+
+from config import GRID_COLS, GRID_ROWS, INITIAL_LENGTH, GROWTH_PER_FOOD, RANDOM_SEED
+
+# Direction codes, in ``replay.NAMES`` order.
+UP, DOWN, LEFT, RIGHT = 0, 1, 2, 3
+NO_TURN = -1
+OPPOSITE = np.array((DOWN, UP, RIGHT, LEFT), np.int8)
+SPAWN_TRIES = 8     # vectorised random picks before falling back per game
+
+
+class BatchEngine:
+    """*n* games on a *cols* × *rows* board, stepped together.
+
+    Each board is stored with a one-cell border that is permanently
+    occupied, so hitting a wall and hitting the body are the same lookup.
+    Cells are flat indices into that padded board (``cell``/``xy``
+    convert).  ``body[i]`` is a ring buffer whose slot ``head_at[i]``
+    holds the head and the ``length[i] - 1`` slots before it the rest of
+    the snake.  Ended games keep their final state until ``reset``.
+    """
+
+    def __init__(self, n: int, cols: int = GRID_COLS, rows: int = GRID_ROWS,
+                 seed: int = RANDOM_SEED):
+        self.n, self.cols, self.rows = n, cols, rows
+        self.stride = cols + 2
+        self.cells = self.stride * (rows + 2)
+        self.ring = 1 << (cols * rows).bit_length()     # power of two > cols * rows
+        self.rng = np.random.default_rng(seed)
+        self.body = np.zeros((n, self.ring), np.int32)
+        self.grid = np.ones((n, self.cells), np.uint8)
+        self.grid.reshape(n, rows + 2, self.stride)[:, 1:-1, 1:-1] = 0
+        self._empty = self.grid[0].copy()
+        self._body = self.body.reshape(-1)              # flat views for indexing
+        self._grid = self.grid.reshape(-1)
+        self.delta = np.array((-self.stride, self.stride, -1, 1), np.int32)
+        self.head_at = np.zeros(n, np.int32)
+        self.length = np.zeros(n, np.int32)
+        self.head = np.zeros(n, np.int32)
+        self.direction = np.zeros(n, np.int8)
+        self.pending_growth = np.zeros(n, np.int32)
+        self.food = np.zeros(n, np.int32)
+        self.score = np.zeros(n, np.int32)
+        self.steps = np.zeros(n, np.int32)
+        self.alive = np.zeros(n, bool)
+        self.board_full = np.zeros(n, bool)
+        self._rows = np.arange(n)
+        self.reset()
+
+    # ── coordinates ────────────────────────────────────────────────
+    def cell(self, x, y):
+        """Flat padded-board index of (*x*, *y*); works on arrays too."""
+        return (y + 1) * self.stride + x + 1
+
+    def xy(self, cell):
+        """Inverse of ``cell``: (x, y), as ints or arrays."""
+        y, x = divmod(cell, self.stride)
+        return x - 1, y - 1
+
+    @property
+    def grids(self):
+        """Occupancy as an (n, rows, cols) view of ``grid`` without the border."""
+        return self.grid.reshape(self.n, self.rows + 2, self.stride)[:, 1:-1, 1:-1]
+
+    # ── reset ──────────────────────────────────────────────────────
+    def reset(self, mask=None) -> None:
+        """Restart every game, or those where *mask* is True, like ``Snake.reset``."""
+        idx = self._rows if mask is None else np.flatnonzero(mask)
+        if not len(idx):
+            return
+        start = self.cell(self.cols // 2 - np.arange(INITIAL_LENGTH - 1, -1, -1), self.rows // 2)
+        self.grid[idx] = self._empty
+        self.body[idx, :INITIAL_LENGTH] = start            # tail ... head
+        self.grid[idx[:, None], start] = 1
+        self.head_at[idx] = INITIAL_LENGTH - 1
+        self.length[idx] = INITIAL_LENGTH
+        self.head[idx] = start[-1]
+        self.direction[idx] = RIGHT
+        self.pending_growth[idx] = 0
+        self.score[idx] = 0
+        self.steps[idx] = 0
+        self.alive[idx] = True
+        self.board_full[idx] = False
+        self._spawn(idx)
+
+    # ── step ───────────────────────────────────────────────────────
+    def step(self, actions=None):
+        """Advance every live game one tick.
+
+        *actions* holds a direction code per game (``NO_TURN`` to keep
+        going); reversals are ignored as in ``Snake.set_direction``.
+        Returns boolean arrays ``(eaten, ended)`` for this tick.
+        """
+        live = np.flatnonzero(self.alive)
+        eaten = np.zeros(self.n, bool)
+        ended = np.zeros(self.n, bool)
+        if not len(live):
+            return eaten, ended
+        d = self.direction[live]
+        if actions is not None:
+            a = np.asarray(actions, np.int8)[live]
+            turn = (a >= 0) & (a != OPPOSITE[d])
+            d = np.where(turn, a, d)
+            self.direction[live] = d
+        self.steps[live] += 1
+
+        off = live * self.cells
+        new_head = self.head[live] + self.delta[d]
+        dead = self._grid[off + new_head] != 0          # wall or body
+        if dead.any():
+            ended[live[dead]] = True
+            self.alive[live[dead]] = False
+            keep = ~dead
+            live, new_head, off = live[keep], new_head[keep], off[keep]
+
+        # push the new head
+        mask = self.ring - 1
+        at = (self.head_at[live] + 1) & mask
+        self.head_at[live] = at
+        self._body[live * self.ring + at] = new_head
+        self._grid[off + new_head] = 1
+        self.head[live] = new_head
+
+        # grow, or give up the tail cell
+        growing = self.pending_growth[live] > 0
+        g = live[growing]
+        self.pending_growth[g] -= 1
+        self.length[g] += 1
+        moving = ~growing
+        s = live[moving]
+        tail = self._body[s * self.ring + ((at[moving] - self.length[s]) & mask)]
+        self._grid[off[moving] + tail] = 0
+
+        # food
+        ate = live[new_head == self.food[live]]
+        if len(ate):
+            eaten[ate] = True
+            self.score[ate] += 1
+            self.pending_growth[ate] += GROWTH_PER_FOOD
+            full = self._spawn(ate)
+            if len(full):
+                ended[full] = True
+                self.alive[full] = False
+        return eaten, ended
+
+    def _spawn(self, idx):
+        """Put food on a random free cell of each game in *idx*.
+
+        Returns the games with no free cell (``board_full``)."""
+        todo = idx
+        for _ in range(SPAWN_TRIES):
+            pick = self.rng.integers(0, self.cells, len(todo), dtype=np.int32)
+            free = self._grid[todo * self.cells + pick] == 0    # border counts as taken
+            self.food[todo[free]] = pick[free]
+            todo = todo[~free]
+            if not len(todo):
+                return todo
+        full = []
+        for i in todo:                      # crowded boards: pick from the free list
+            cells = np.flatnonzero(self.grid[i] == 0)
+            if len(cells):
+                self.food[i] = cells[self.rng.integers(len(cells))]
+            else:
+                self.food[i] = -1
+                self.board_full[i] = True
+                full.append(i)
+        return np.array(full, np.int64)
+
+    # ── helpers ────────────────────────────────────────────────────
+    def cells_of(self, i: int):
+        """Body of game *i* as (x, y) tuples, head first (for debugging/tests)."""
+        at, n = self.head_at[i], self.length[i]
+        flat = self.body[i, (at - np.arange(n)) & (self.ring - 1)]
+        return [tuple(int(v) for v in self.xy(c)) for c in flat]
@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""Snake Bug Quest — benchmarks for the tick and render hot paths.
+
+    python bench.py                           # run, print a table
+    python bench.py --out base.json           # ... and save the results
+    python bench.py --compare base.json       # flag regressions against base.json
+    python bench.py --only snake,draw         # a subset (name prefixes)
+
+Micro benchmarks time ``Snake.update`` at several lengths, ``Food.spawn``
+at several board fills and the per-tick detector cost of every stage.
+Macro benchmarks time ``Renderer.draw`` frames, whole headless games,
+ticks and frames of a long snake on a marathon-size board and of an
+endless game near a full board, autopilot moves on the default and
+marathon boards and, with NumPy installed, the batch engine's game-steps
+and offscreen pixel frames per second.  Each figure is the best of a few
+repeats.  ``--compare`` exits with status 1 when any result is more than
+``--threshold`` percent worse.
+
+The snake is steered around a Hamiltonian cycle (``hamilton``), so runs
+are deterministic and never die on the walls; the full-board runs start
+at 95% fill and let the cycle solver take shortcuts.  Rendering uses
+SDL's dummy video driver unless SDL_VIDEODRIVER is set.
+"""
+
+import argparse, json, os, platform, sys, time
+from datetime import datetime
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from config import GRID_COLS, GRID_ROWS, MARATHON_SIZE, TOTAL_STAGES
+from board import FreeCells
+from engine import Engine
+from food import Food
+from hamilton import CyclePilot
+from snake import Body, Snake
+
+LENGTHS = (3, 30, 120, 240, 480)
+FILLS = (0, 25, 50, 75, 90, 99)
+REPEAT = 5
+THRESHOLD = 10.0    # percent
+
+
+PILOT = CyclePilot(shortcuts=False)
+CYCLE, STEER = PILOT.cycle, PILOT.steer
+
+
+def _best(run, number, repeat=REPEAT):
+    """Best seconds per call of ``run(number)`` over *repeat* tries."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        run(number)
+        best = min(best, time.perf_counter() - t0)
+    return best / number
+
+
+def _snake_on_cycle(length):
+    """A Snake lying along CYCLE, head first."""
+    s = Snake()
+    k = length - 1
+    s.body = Body((CYCLE[(k - j) % len(CYCLE)] for j in range(length)), free=FreeCells())
+    s.direction = STEER[s.head]
+    return s
+
+
+# ── micro ──────────────────────────────────────────────────────────
+def bench_snake(scale):
+    out = {}
+    for length in LENGTHS:
+        s = _snake_on_cycle(length)
+
+        def run(n, s=s):
+            for _ in range(n):
+                s.direction = STEER[s.body[0]]
+                if not s.update():
+                    raise RuntimeError(f"snake died at length {len(s.body)}")
+
+        out[f"snake.update[len={length}]"] = (_best(run, 20_000 // scale) * 1e9, "ns", "lower")
+    return out
+
+
+def bench_spawn(scale):
+    out = {}
+    n_cells = GRID_COLS * GRID_ROWS
+    for fill in FILLS:
+        length = max(1, n_cells * fill // 100)
+        body = _snake_on_cycle(length).body
+        cells = list(body)
+        food = Food()
+        out[f"food.spawn[fill={fill}%]"] = (
+            _best(lambda n: [food.spawn(body) for _ in range(n)], 20_000 // scale) * 1e9,
+            "ns", "lower")
+        out[f"food.spawn_list[fill={fill}%]"] = (
+            _best(lambda n: [food.spawn(cells) for _ in range(n)], 2_000 // scale) * 1e9,
+            "ns", "lower")
+    return out
+
+
+def _cycling_engine(stage):
+    e = Engine(stage=stage)
+    e.snake = _snake_on_cycle(len(e.snake.body))
+    e.food.spawn(e.snake.body)
+    e._start_tracker()
+    return e
+
+
+def bench_tracker(scale):
+    """Engine tick cost per stage; the 'none' row has no detector hooks."""
+    out = {}
+    for stage in list(range(1, TOTAL_STAGES + 1)) + [None]:
+        number = stage or TOTAL_STAGES + 1
+        box = [_cycling_engine(number)]
+
+        def run(n, box=box, number=number):
+            e = box[0]
+            for _ in range(n):
+                e.snake.direction = STEER[e.snake.body[0]]
+                e._tick()
+                if not e.alive:
+                    e = box[0] = _cycling_engine(number)
+                elif e.stage != number:                 # cleared: keep timing this stage
+                    e.stage = number
+                    e._start_tracker()
+
+        out[f"tick[stage={stage or 'none'}]"] = (_best(run, 20_000 // scale) * 1e9, "ns", "lower")
+    return out
+
+
+# ── macro ──────────────────────────────────────────────────────────
+def bench_draw(scale):
+    import pygame
+    from config import WINDOW_WIDTH, WINDOW_HEIGHT
+    from renderer import Renderer
+
+    pygame.init()
+    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    r = Renderer(screen, pygame.font.SysFont("monospace", 16),
+                 pygame.font.SysFont("monospace", 28, bold=True))
+    e = _cycling_engine(1)
+    e.snake = _snake_on_cycle(120)
+
+    def frames(prepare, alpha=None):
+        def run(n):
+            for i in range(n):
+                prepare()
+                r.draw(e, alpha and (i % 4) / 4)
+        return run
+
+    def move():
+        e.snake.direction = STEER[e.snake.body[0]]
+        e.snake.update()
+
+    def move_and_score():
+        move()
+        e.score += 1
+
+    def full():
+        move()
+        r.invalidate()
+
+    out = {}
+    n = 2_000 // scale
+    r.invalidate()
+    out["draw[steady]"] = (_best(frames(move), n) * 1e6, "us", "lower")
+    out["draw[interpolated]"] = (_best(frames(move, alpha=True), n) * 1e6, "us", "lower")
+    out["draw[panel]"] = (_best(frames(move_and_score), n) * 1e6, "us", "lower")
+    out["draw[full]"] = (_best(frames(full), n // 4) * 1e6, "us", "lower")
+    e.alive = False
+    out["draw[overlay]"] = (_best(frames(full), n // 4) * 1e6, "us", "lower")
+    pygame.quit()
+    return out
+
+
+def bench_headless(scale):
+    """Whole headless games steered round the cycle, restarted as they end."""
+    ticks = 100_000 // scale
+
+    def steer(g):
+        g.snake.direction = STEER[g.snake.head]
+
+    def run(n):
+        left = n
+        while left > 0:
+            left -= _cycling_engine(1).run(steer, max_ticks=left) or 1
+    return {"headless[ticks/s]": (1 / _best(run, ticks, 3), "ticks/s", "higher")}
+
+
+def bench_marathon(scale):
+    """A snake zigzagging down a MARATHON_SIZE board, growing as it goes."""
+    import pygame
+    from config import WINDOW_WIDTH, WINDOW_HEIGHT
+    from renderer import Renderer
+
+    pygame.init()
+    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    r = Renderer(screen, pygame.font.SysFont("monospace", 16),
+                 pygame.font.SysFont("monospace", 28, bold=True))
+    cols, rows = MARATHON_SIZE
+    e = Engine(stage=TOTAL_STAGES + 1, cols=cols, rows=rows)
+    e.snake.pending_growth = 50_000
+    lap = [(1, 0)] * 150 + [(0, 1)] * 3 + [(-1, 0)] * 150 + [(0, 1)] * 3
+
+    def ticks(n):
+        for _ in range(n):
+            e.snake.direction = lap[e.frame % len(lap)]
+            e._tick()
+
+    def frames(n):
+        for _ in range(n):
+            ticks(1)
+            r.draw(e, 0.5)
+
+    out = {}
+    out["marathon.tick"] = (_best(ticks, 20_000 // scale) * 1e9, "ns", "lower")
+    out["marathon.draw"] = (_best(frames, 2_000 // scale) * 1e6, "us", "lower")
+    e.food.spawn(e.snake.body)
+    out["marathon.spawn"] = (
+        _best(lambda n: [e.food.spawn(e.snake.body) for _ in range(n)], 20_000 // scale) * 1e9,
+        "ns", "lower")
+    pygame.quit()
+    return out
+
+
+def bench_full(scale):
+    """Ticks and frames of CyclePilot in an endless game from 95% fill,
+    restarted when it ends; eating, growth and spawns run near 100% fill
+    once the game's bugs are fixed."""
+    import pygame
+    from config import WINDOW_WIDTH, WINDOW_HEIGHT
+    from renderer import Renderer
+
+    pygame.init()
+    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    r = Renderer(screen, pygame.font.SysFont("monospace", 16),
+                 pygame.font.SysFont("monospace", 28, bold=True))
+    pilot = CyclePilot()
+
+    def new_game():
+        e = Engine(stage=TOTAL_STAGES + 1, endless=True)
+        e.snake = _snake_on_cycle(len(CYCLE) * 95 // 100)
+        e.food.spawn(e.snake.body)
+        return e
+
+    box = [new_game()]
+
+    def ticks(n, draw=False):
+        e = box[0]
+        for _ in range(n):
+            if not e.step(pilot.direction(e)):
+                e = box[0] = new_game()
+            if draw:
+                r.draw(e, 0.5)
+
+    out = {}
+    out["full.tick"] = (_best(ticks, 20_000 // scale) * 1e9, "ns", "lower")
+    out["full.draw"] = (_best(lambda n: ticks(n, draw=True), 2_000 // scale) * 1e6, "us", "lower")
+    pygame.quit()
+    return out
+
+
+def bench_autopilot(scale):
+    """Autopilot move + tick in whole games (restarted as they end), on the
+    default board and on a MARATHON_SIZE board."""
+    from autopilot import Autopilot
+
+    out = {}
+    for key, (cols, rows), number in (("autopilot.move", (GRID_COLS, GRID_ROWS), 5_000),
+                                      ("autopilot.move[marathon]", MARATHON_SIZE, 1_000)):
+        def new_game(cols=cols, rows=rows):
+            e = Engine(stage=TOTAL_STAGES + 1, cols=cols, rows=rows)
+            return e, Autopilot()
+
+        box = [new_game()]
+
+        def run(n, box=box, new_game=new_game):
+            e, pilot = box[0]
+            for _ in range(n):
+                move = pilot(e)
+                if move:
+                    e.turn(move)
+                e._tick()
+                if not e.alive:
+                    e, pilot = box[0] = new_game()
+
+        out[key] = (_best(run, number // scale, 3) * 1e6, "us", "lower")
+    return out
+
+
+def bench_batch(scale):
+    """``BatchEngine.step`` over 4096 games with random turns, ended games
+    restarted each step; skipped without NumPy."""
+    try:
+        import numpy as np
+        from batch import BatchEngine
+    except ImportError:
+        return {}
+    n = 4096
+    b = BatchEngine(n, seed=1)
+    actions = np.random.default_rng(1).integers(-1, 4, (64, n), dtype=np.int8)
+
+    def run(steps):
+        for i in range(steps):
+            _, ended = b.step(actions[i % len(actions)])
+            b.reset(ended)
+
+    return {"batch[steps/s]": (n / _best(run, 1_000 // scale, 3), "steps/s", "higher")}
+
+
+def bench_pixels(scale):
+    """``PixelRenderer`` frames from a batch of 64 boards; skipped without NumPy."""
+    try:
+        from batch import BatchEngine
+        from pixels import PixelRenderer
+    except ImportError:
+        return {}
+    b = BatchEngine(64, seed=1)
+    for _ in range(10):
+        b.step()
+    out = {}
+    for cell in (25, 4):
+        px = PixelRenderer(cell=cell)
+        frames = px.render_batch(b)
+
+        def run(n, px=px, frames=frames):
+            for _ in range(n):
+                px.render_batch(b, frames)
+
+        out[f"pixels[cell={cell}][frames/s]"] = (
+            b.n / _best(run, 100 // scale or 1, 3), "frames/s", "higher")
+    return out
+
+
+BENCHES = {
+    "snake": bench_snake,
+    "spawn": bench_spawn,
+    "tick": bench_tracker,
+    "draw": bench_draw,
+    "headless": bench_headless,
+    "marathon": bench_marathon,
+    "full": bench_full,
+    "autopilot": bench_autopilot,
+    "batch": bench_batch,
+    "pixels": bench_pixels,
+}
+
+
+# ── results ────────────────────────────────────────────────────────
+def run(only=None, scale=1):
+    results = {}
+    for name, bench in BENCHES.items():
+        if only and not any(name.startswith(p) for p in only):
+            continue
+        for key, (value, unit, better) in bench(scale).items():
+            results[key] = {"value": value, "unit": unit, "better": better}
+            print(f"  {key:<28} {value:>12.1f} {unit}", flush=True)
+    return {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+
+def compare(base, current, threshold=THRESHOLD) -> int:
+    """Print per-result changes; returns the number of regressions."""
+    regressions = 0
+    print(f"\n{'benchmark':<28} {'base':>12} {'now':>12} {'change':>8}")
+    for key, now in current["results"].items():
+        old = base["results"].get(key)
+        if old is None:
+            print(f"{key:<28} {'-':>12} {now['value']:>12.1f}      new")
+            continue
+        change = (now["value"] - old["value"]) / old["value"] * 100
+        worse = change if now["better"] == "lower" else -change
+        flag = ""
+        if worse > threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{key:<28} {old['value']:>12.1f} {now['value']:>12.1f} {change:>+7.1f}%{flag}")
+    return regressions
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Benchmark the tick and render hot paths")
+    ap.add_argument("--out", help="save results as JSON")
+    ap.add_argument("--compare", metavar="BASE", help="compare with a saved JSON baseline")
+    ap.add_argument("--threshold", type=float, default=THRESHOLD,
+                    help="percent slowdown counted as a regression (default %(default)s)")
+    ap.add_argument("--only", help="comma-separated benchmark groups: " + ", ".join(BENCHES))
+    ap.add_argument("--quick", action="store_true", help="10x fewer iterations")
+    args = ap.parse_args()
+
+    current = run(args.only and args.only.split(","), 10 if args.quick else 1)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(current, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            base = json.load(f)
+        sys.exit(1 if compare(base, current, args.threshold) else 0)
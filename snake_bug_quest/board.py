@@ -0,0 +1,119 @@
+"""Snake Bug Quest — free-cell index for the grid.
+
+``FreeCells`` lists every free cell, so spawns stay O(1) even on a nearly
+full board; its memory grows with the grid.  ``SparseCells`` records only
+the occupied cells, for marathon boards where the snake covers a tiny
+fraction of the grid.  ``free_cells`` picks ``FreeCells`` up to the
+default board size (SPARSE_CELLS) and ``SparseCells`` beyond it.
+"""
+
+from config import GRID_COLS, GRID_ROWS, SPARSE_CELLS, SPARSE_TRIES
+
+
+class FreeCells:
+    """Unoccupied cells of the grid, as a swap-remove array + position map.
+
+    ``add``, ``discard``, membership and ``choice`` are all O(1), so picking
+    a free cell costs the same at 0% and at 99% board fill.
+    """
+
+    def __init__(self, cols: int = GRID_COLS, rows: int = GRID_ROWS):
+        self.cols, self.rows = cols, rows
+        self._cells = [(x, y) for y in range(rows) for x in range(cols)]
+        self._pos = {cell: i for i, cell in enumerate(self._cells)}
+
+    def add(self, cell):
+        """Mark *cell* free again (ignored if off-grid or already free)."""
+        x, y = cell
+        if cell in self._pos or not (0 <= x < self.cols and 0 <= y < self.rows):
+            return
+        self._pos[cell] = len(self._cells)
+        self._cells.append(cell)
+
+    def discard(self, cell):
+        """Mark *cell* occupied (ignored if not currently free)."""
+        i = self._pos.pop(cell, None)
+        if i is None:
+            return
+        last = self._cells.pop()
+        if last != cell:
+            self._cells[i] = last
+            self._pos[last] = i
+
+    def choice(self, rng):
+        """Random free cell drawn with *rng*; IndexError when the board is full."""
+        return self._cells[rng.randrange(len(self._cells))]
+
+    def __contains__(self, cell):
+        return cell in self._pos
+
+    def __len__(self):
+        return len(self._cells)
+
+
+class SparseCells:
+    """Free-cell index that stores occupied cells only (same interface).
+
+    Memory is proportional to the snake, not the grid.  ``choice`` tries
+    a few uniform random cells, which almost always hit a free one while
+    the board is mostly empty, then falls back to walking per-row counts:
+    O(rows + cols), never a pass over every cell.
+    """
+
+    def __init__(self, cols: int = GRID_COLS, rows: int = GRID_ROWS):
+        self.cols, self.rows = cols, rows
+        self._taken = set()
+        self._row_taken = {}      # y -> occupied cells in row y
+
+    def add(self, cell):
+        """Mark *cell* free again (ignored if off-grid or already free)."""
+        if cell in self._taken:
+            self._taken.remove(cell)
+            y = cell[1]
+            n = self._row_taken[y] - 1
+            if n:
+                self._row_taken[y] = n
+            else:
+                del self._row_taken[y]
+
+    def discard(self, cell):
+        """Mark *cell* occupied (ignored if off-grid or already occupied)."""
+        x, y = cell
+        if cell in self._taken or not (0 <= x < self.cols and 0 <= y < self.rows):
+            return
+        self._taken.add(cell)
+        self._row_taken[y] = self._row_taken.get(y, 0) + 1
+
+    def choice(self, rng):
+        """Random free cell drawn with *rng*; IndexError when the board is full."""
+        cols, rows, taken = self.cols, self.rows, self._taken
+        for _ in range(SPARSE_TRIES):
+            cell = (rng.randrange(cols), rng.randrange(rows))
+            if cell not in taken:
+                return cell
+        k = rng.randrange(len(self))
+        for y in range(rows):
+            free = cols - self._row_taken.get(y, 0)
+            if k >= free:
+                k -= free
+                continue
+            for x in range(cols):
+                if (x, y) not in taken:
+                    if not k:
+                        return (x, y)
+                    k -= 1
+        raise IndexError("no free cell")
+
+    def __contains__(self, cell):
+        x, y = cell
+        return 0 <= x < self.cols and 0 <= y < self.rows and cell not in self._taken
+
+    def __len__(self):
+        return self.cols * self.rows - len(self._taken)
+
+
+def free_cells(cols: int = GRID_COLS, rows: int = GRID_ROWS):
+    """An empty free-cell index for a *cols* × *rows* board."""
+    if cols * rows > SPARSE_CELLS:
+        return SparseCells(cols, rows)
+    return FreeCells(cols, rows)
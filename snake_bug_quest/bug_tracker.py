@@ -1,113 +1,197 @@
-"""Snake Bug Quest — fix detectors for stages 1-7."""
+"""Snake Bug Quest — fix detectors for stages 1-7.
 
-from config import (
-    DIR_LEFT, GRID_ROWS, SPEED_CAP, TOTAL_STAGES,
-)
+Detectors are event-driven.  Each stage subscribes to the game events it
+needs; the subscriptions are resolved once, when the tracker is created,
+into ``on_<event>`` attributes (None when unsubscribed).  The engine fires
+only the hooks that are set, so a tick where nothing relevant happened
+costs a few attribute checks and no scans of the game state.
+
+Events (all receive the engine):
+    start    tracker created (new game or previous stage cleared)
+    left     the LEFT key was pressed
+    turn     the snake's direction changed this tick
+    wall     the head is within WALL_BAND cells of a wall, or off the grid
+    grow     the body got longer this tick
+    overlap  two body segments share a cell
+    speed    tick_rate changed this tick
+    eat      score changed this tick
+    spawn    food moved this tick
+    timer    the frame reached ``wake_at`` (one-shot; re-arm to repeat)
+"""
+
+from config import DIR_LEFT, SPEED_CAP, WALL_BAND
+
+EVENTS = ("start", "left", "turn", "wall", "grow", "overlap",
+          "speed", "eat", "spawn", "timer")
+NEVER = float("inf")
 
 
 class BugTracker:
-    """Observes game state each tick; returns True when current stage is fixed."""
+    """Listens to game events; ``fixed`` turns True when current stage is fixed."""
+
+    # stage → {event: handler name}
+    HOOKS = {
+        1: {"left": "_s1_left", "turn": "_s1_turn", "timer": "_s1_timer"},
+        2: {"start": "_s2_start", "eat": "_s2_eat", "timer": "_s2_timer"},
+        3: {"start": "_s3_start", "eat": "_s3_eat", "timer": "_s3_timer"},
+        4: {"spawn": "_s4_spawn"},
+        5: {"start": "_s5_start", "speed": "_s5_speed", "eat": "_s5_check",
+            "timer": "_s5_check"},
+        6: {"start": "_s6_start", "wall": "_s6_wall", "timer": "_s6_check"},
+        7: {"start": "_s7_start", "grow": "_s7_grow", "overlap": "_s7_overlap",
+            "timer": "_s7_check"},
+    }
+
+    # everything a stage's handlers read or write, for snapshot/restore
+    STATE = ("fixed", "wake_at", "_left_until", "_eat_snap_len", "_good_spawns",
+             "_ok_from", "_bottom_visits", "_clean_from")
 
     def __init__(self, stage: int):
         self.stage = stage
+        self.fixed = False
+        self.wake_at = NEVER
         # per-stage accumulators
-        self._left_req = False
-        self._left_ttl = 0
-        self._prev_score = 0
-        self._prev_food = None
+        self._left_until = -1
         self._eat_snap_len = None
-        self._eat_watch = 0
-        self._eat_events = 0
         self._good_spawns = 0
-        self._speed_ok_ticks = 0
+        self._ok_from = None
         self._bottom_visits = 0
-        self._bottom_ok = 0
-        self._clean_body_ticks = 0
-
-    # ── public entry point (called every tick) ─────────────────────
-    def tick(self, game) -> bool:
-        handler = {
-            1: self._s1, 2: self._s2, 3: self._s3,
-            4: self._s4, 5: self._s5, 6: self._s6, 7: self._s7,
-        }.get(self.stage)
-        return handler(game) if handler else False
-
-    # ── notifications from game loop ───────────────────────────────
-    def notify_left(self):
-        self._left_req = True
-        self._left_ttl = 0
-
-    def notify_spawn(self, food_pos, snake_body):
-        if self.stage == 4:
-            if food_pos in snake_body:
-                self._good_spawns = 0
-            else:
-                self._good_spawns += 1
-
-    # ── stage detectors ────────────────────────────────────────────
-    def _s1(self, g) -> bool:
-        """LEFT direction accepted at least once."""
-        if self._left_req:
-            self._left_ttl += 1
-            if g.snake.direction == DIR_LEFT:
-                return True
-            if self._left_ttl > 8:
-                self._left_req = False
-        return False
-
-    def _s2(self, g) -> bool:
-        """Score increases and food repositions after eating."""
-        s, f = g.score, g.food.position
-        if s > self._prev_score and f != self._prev_food:
-            return True
-        self._prev_score, self._prev_food = s, f
-        return False
-
-    def _s3(self, g) -> bool:
-        """After eating, length grows by exactly 1 (not more)."""
-        s, ln = g.score, g.snake.length
-        if s > self._eat_events:
-            self._eat_events = s
-            self._eat_snap_len = ln
-            self._eat_watch = 0
-            return False
-        if self._eat_snap_len is not None:
-            self._eat_watch += 1
-            if self._eat_watch > 8:
-                if ln - self._eat_snap_len <= 1:
-                    return True
-                self._eat_snap_len = None
-        return False
-
-    def _s4(self, g) -> bool:
-        """Food never overlaps snake body (3 clean spawns in a row)."""
-        return self._good_spawns >= 3
-
-    def _s5(self, g) -> bool:
-        """Speed stays below cap and doesn't increase every frame."""
+        self._clean_from = None
+        # event subscriptions, resolved once per stage
+        hooks = self.HOOKS.get(stage, {})
+        for event in EVENTS:
+            name = hooks.get(event)
+            setattr(self, f"on_{event}", getattr(self, name) if name else None)
+
+    def snapshot(self):
+        return (self.stage,) + tuple(getattr(self, name) for name in self.STATE)
+
+    def restore(self, snap):
+        """Load counters from ``snapshot()``; the tracker must be for the same stage."""
+        for name, value in zip(self.STATE, snap[1:]):
+            setattr(self, name, value)
+
+    # ── stage 1 ────────────────────────────────────────────────────
+    # LEFT direction accepted within 9 ticks of pressing LEFT.
+    def _s1_left(self, g):
+        self._left_until = g.frame + 9
+        if g.snake.direction == DIR_LEFT:
+            self.wake_at = g.frame + 1
+
+    def _s1_turn(self, g):
+        if g.snake.direction == DIR_LEFT and g.frame <= self._left_until:
+            self.fixed = True
+
+    def _s1_timer(self, g):
+        if g.snake.direction == DIR_LEFT:
+            self.fixed = True
+
+    # ── stage 2 ────────────────────────────────────────────────────
+    # Score increases and food repositions after eating.
+    def _s2_start(self, g):
+        if g.score > 0:
+            self.wake_at = g.frame + 1
+
+    def _s2_eat(self, g):
+        if g.food.position not in (None, g.snake.head):
+            self.fixed = True
+
+    def _s2_timer(self, g):
+        if g.food.position is not None:
+            self.fixed = True
+
+    # ── stage 3 ────────────────────────────────────────────────────
+    # After eating, length grows by exactly 1 (not more) over 9 ticks.
+    def _s3_start(self, g):
+        if g.score > 0:
+            self._eat_snap_len = None
+            self.wake_at = g.frame + 1
+
+    def _s3_eat(self, g):
+        self._eat_snap_len = g.snake.length
+        self.wake_at = g.frame + 9
+
+    def _s3_timer(self, g):
+        if self._eat_snap_len is None:
+            self._s3_eat(g)
+        elif g.snake.length - self._eat_snap_len <= 1:
+            self.fixed = True
+        else:
+            self._eat_snap_len = None
+
+    # ── stage 4 ────────────────────────────────────────────────────
+    # Food never overlaps snake body (3 clean spawns in a row).
+    def _s4_spawn(self, g):
+        if g.food.position in g.snake.body:
+            self._good_spawns = 0
+        else:
+            self._good_spawns += 1
+        self.fixed = self._good_spawns >= 3
+
+    # ── stage 5 ────────────────────────────────────────────────────
+    # Speed stays below cap for 61 ticks with a score of 8 or more.
+    def _s5_start(self, g):
+        if g.tick_rate <= SPEED_CAP:
+            self._ok_from = g.frame + 1
+            self.wake_at = self._ok_from + 60
+
+    def _s5_speed(self, g):
         if g.tick_rate > SPEED_CAP:
-            self._speed_ok_ticks = 0
-            return False
-        self._speed_ok_ticks += 1
-        return g.score >= 8 and self._speed_ok_ticks > 60
+            self._ok_from = None
+            self.wake_at = NEVER
+        elif self._ok_from is None:
+            self._ok_from = g.frame
+            self.wake_at = self._ok_from + 60
+
+    def _s5_check(self, g):
+        if (self._ok_from is not None and g.frame >= self._ok_from + 60
+                and g.score >= 8):
+            self.fixed = True
+
+    # ── stage 6 ────────────────────────────────────────────────────
+    # Bottom wall works: two ticks near it and 40 without escaping.
+    def _s6_start(self, g):
+        self._ok_from = g.frame + 1
 
-    def _s6(self, g) -> bool:
-        """Bottom wall works: snake head never escapes past GRID_ROWS."""
+    def _s6_wall(self, g):
         hy = g.snake.head[1]
-        if hy >= GRID_ROWS:
-            self._bottom_ok = 0
-            return False
-        if hy >= GRID_ROWS - 3:
+        if hy >= g.rows:
+            self._ok_from = g.frame + 1
+            return
+        if hy >= g.rows - WALL_BAND:
             self._bottom_visits += 1
-        self._bottom_ok += 1
-        return self._bottom_visits >= 2 and self._bottom_ok >= 40
-
-    def _s7(self, g) -> bool:
-        """No duplicate body cells while alive (self-collision works)."""
-        body = g.snake.body
-        if len(body) != len(set(body)):
-            self._clean_body_ticks = 0
-            return False
+        self._s6_check(g)
+
+    def _s6_check(self, g):
+        if self._bottom_visits < 2:
+            return
+        due = self._ok_from + 39
+        if g.frame >= due:
+            self.fixed = True
+        else:
+            self.wake_at = due
+
+    # ── stage 7 ────────────────────────────────────────────────────
+    # No duplicate body cells for 80 ticks at length > 5.
+    def _s7_start(self, g):
+        if g.snake.length > 5:
+            self._clean_from = g.frame + 1
+            self.wake_at = self._clean_from + 79
+
+    def _s7_grow(self, g):
+        if self._clean_from is None and g.snake.length > 5:
+            self._clean_from = g.frame
+            self.wake_at = self._clean_from + 79
+
+    def _s7_overlap(self, g):
+        self._clean_from = None
+        self.wake_at = NEVER
         if g.snake.length > 5:
-            self._clean_body_ticks += 1
-        return self._clean_body_ticks >= 80
+            self._clean_from = g.frame + 1
+            self.wake_at = self._clean_from + 79
+
+    def _s7_check(self, g):
+        if self._clean_from is not None and g.frame >= self._clean_from + 79:
+            self.fixed = True
+        elif self._clean_from is not None:
+            self.wake_at = self._clean_from + 79
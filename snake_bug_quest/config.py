@@ -10,6 +10,20 @@ PANEL_WIDTH = 260
 GAME_AREA_WIDTH = CELL_SIZE * GRID_COLS
 WINDOW_WIDTH = GAME_AREA_WIDTH + PANEL_WIDTH
 WINDOW_HEIGHT = CELL_SIZE * GRID_ROWS
+MARATHON_SIZE = (2000, 2000)   # main.py --marathon board (cols, rows); the view stays 24×20
+CAMERA_MARGIN = 4           # cells kept between the head and the view edge
+SPARSE_CELLS = GRID_COLS * GRID_ROWS   # bigger boards track only occupied cells
+SPARSE_TRIES = 32           # random picks before a sparse spawn walks the rows
+SPAWN_TRIES = 32            # random picks before a spawn off a plain cell list builds an index
+RENDER_FPS = 60             # input polling + drawing; ticks run at tick_rate
+MAX_TICKS_PER_FRAME = 5     # catch-up limit before late ticks are dropped
+PROFILE_FRAMES = 600        # samples kept per loop phase (F3 HUD, F4 trace)
+HUD_REFRESH = 30            # frames between HUD updates
+PROFILE_TRACE = "frame_trace.json"
+LOG_LEVEL = "debug"         # debug shows the periodic status line
+LOG_BUFFER = 4096           # records held between background flushes
+LOG_FLUSH_INTERVAL = 0.5    # seconds
+REWIND_TICKS = 600          # ticks kept for stepping back with [ and ]
 
 # ── Colours ────────────────────────────────────────────────────────
 BG_COLOR = (15, 15, 26)
@@ -33,6 +47,13 @@ SPEED_SCORE_INTERVAL = 5
 SPEED_CAP = 14
 RANDOM_SEED = 42
 TOTAL_STAGES = 7
+INPUT_BUFFER = 3            # turns queued ahead; one is applied per tick
+WALL_BAND = 3               # cells from a wall that count as "approaching" it
+BODY_JOURNAL = 256          # popped tail cells kept for undoing to a snapshot
+AUTOPILOT_IDLE = 30.0       # seconds without a key before the kiosk plays itself
+AUTOPILOT_RESTART = 3.0     # seconds a finished autopilot game stays on screen
+AUTOPILOT_FIELD = 16_384    # boards up to this many cells get a whole-board distance field
+AUTOPILOT_REACH = 16        # bigger boards: waypoint distance toward the food
 
 # ── Directions ─────────────────────────────────────────────────────
 DIR_UP = (0, -1)
@@ -56,6 +77,7 @@ NAME_TO_DIR = {
 
 # ── Progress ───────────────────────────────────────────────────────
 PROGRESS_FILE = "progress.json"
+PROGRESS_DB = "progress.db"      # multi-player store (main.py --player)
 
 # ── Stage hints ────────────────────────────────────────────────────
 STAGE_HINTS = {
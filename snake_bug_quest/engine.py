@@ -0,0 +1,240 @@
+"""Snake Bug Quest — headless simulation core (no display, no clock)."""
+
+from typing import NamedTuple
+
+from config import (
+    CELL_SIZE, GRID_COLS, GRID_ROWS, WALL_BAND,
+    INITIAL_SPEED, RANDOM_SEED, TOTAL_STAGES,
+    NAME_TO_DIR,
+)
+from snake import Snake
+from food import Food
+from bug_tracker import BugTracker, NEVER
+from replay import Recording
+
+
+class Snapshot(NamedTuple):
+    """Immutable game state from ``Engine.snapshot``.
+
+    The body and rng state inside are shared with the live game and other
+    snapshots, never copied.
+    """
+    stage: int
+    frame: int
+    score: int
+    tick_rate: int
+    alive: bool
+    board_full: bool
+    all_fixed: bool
+    last_speedup: int
+    snake: tuple
+    food: tuple
+    tracker: tuple
+    recording: tuple
+
+
+class Engine:
+    """Steps Snake, Food and BugTracker as fast as the CPU allows.
+
+    The pygame front-end (``game.Game``) subclasses this and adds input,
+    pacing and rendering on top; everything here runs without pygame
+    being initialised.
+    """
+
+    def __init__(self, stage: int = 1, seed: int = RANDOM_SEED,
+                 record: bool = False, cols: int = GRID_COLS, rows: int = GRID_ROWS,
+                 endless: bool = False):
+        """With *record*, each game's inputs are kept in ``recording``
+        (a ``replay.Recording``) so it can be saved and replayed.  *cols*
+        and *rows* size the board (marathon mode uses large ones).  With
+        *endless* play goes on past the last stage until the snake dies
+        or the board is full; ``stage=TOTAL_STAGES + 1`` then starts a
+        game with no detectors at all."""
+        self.stage = stage
+        self.seed = seed
+        self.record = record
+        self.endless = endless
+        self.cols, self.rows = cols, rows
+        self._new_game()
+
+    def _new_game(self):
+        self.snake = Snake(self.cols, self.rows)
+        self.food = Food(self.seed, self.cols, self.rows)
+        self.food.spawn(self.snake.body)
+        self.score = 0
+        self.tick_rate = INITIAL_SPEED
+        self.alive = True
+        self.board_full = False
+        self.frame = 0
+        self._last_speedup = 0
+        self.all_fixed = self.stage > TOTAL_STAGES
+        self.recording = (Recording(self.stage, self.seed, cols=self.cols, rows=self.rows)
+                          if self.record else None)
+        self._start_tracker()
+
+    def _start_tracker(self):
+        self.tracker = BugTracker(self.stage)
+        if self.tracker.on_start:
+            self.tracker.on_start(self)
+
+    # ── snapshots ──────────────────────────────────────────────────
+    def snapshot(self) -> Snapshot:
+        """The game state now, cheap enough to take every tick of a search."""
+        rec = self.recording
+        return Snapshot(
+            self.stage, self.frame, self.score, self.tick_rate, self.alive,
+            self.board_full, self.all_fixed, self._last_speedup,
+            self.snake.snapshot(), self.food.snapshot(), self.tracker.snapshot(),
+            rec and (len(rec.events), rec.ticks),
+        )
+
+    def restore(self, snap: Snapshot) -> None:
+        """Go back (or forward) to *snap*, taken from this engine.
+
+        Costs O(ticks between the two states) for recent snapshots of the
+        same game, O(snake length) otherwise.  A recording is cut back to
+        the snapshot's inputs.
+        """
+        (self.stage, self.frame, self.score, self.tick_rate, self.alive,
+         self.board_full, self.all_fixed, self._last_speedup) = snap[:8]
+        self.snake.restore(snap.snake)
+        self.food.restore(snap.food)
+        if self.tracker.stage != snap.tracker[0]:
+            self.tracker = BugTracker(snap.tracker[0])
+        self.tracker.restore(snap.tracker)
+        if self.recording is not None and snap.recording:
+            del self.recording.events[snap.recording[0]:]
+            self.recording.ticks = snap.recording[1]
+
+    # ── coordinate helpers (used by renderer + collision) ──────────
+    @staticmethod
+    def _to_screen(cell):
+        """Grid cell → pixel coordinate (top-left corner)."""
+        return (cell[0] * CELL_SIZE, cell[1] * CELL_SIZE)
+
+    # ── input ──────────────────────────────────────────────────────
+    def steer(self, name, stamp=None):
+        """Apply a direction by name: "up", "down", "left" or "right".
+
+        *stamp* is the ``time.perf_counter()`` of the key press, used for
+        ``snake.input_lag``.
+        """
+        direction = NAME_TO_DIR.get(name)
+        if direction:
+            queued = self.snake.set_direction(direction, stamp)
+            # rejected turns change nothing, except that LEFT presses also
+            # reach the stage-1 detector
+            if self.recording is not None and (queued or name == "left"):
+                self.recording.add(self.frame, name)
+            if name == "left" and self.tracker.on_left:
+                self.tracker.on_left(self)
+
+    def turn(self, direction):
+        """Queue a turn by direction vector, as solvers and benchmarks do.
+
+        Unlike ``steer`` this skips the key mapping, the LEFT-key detector
+        and the recording.  Returns True if the turn was queued.
+        """
+        return self.snake.set_direction(direction)
+
+    # ── tick ───────────────────────────────────────────────────────
+    def _tick(self):
+        self.frame += 1
+        if self.recording is not None:
+            self.recording.ticks = self.frame
+        snake = self.snake
+        before = (snake.direction, snake.length, self.score,
+                  self.food.position, self.tick_rate)
+        self.alive = snake.update()
+        if not self.alive:
+            return
+        self._check_food()
+        if not self.alive:
+            return
+        self._update_speed()
+        self._emit(*before)
+        if self.tracker.fixed:
+            self.stage += 1
+            if self.stage > TOTAL_STAGES:
+                self.all_fixed = True
+            self._start_tracker()        # past the last stage: one with no hooks
+            self._on_stage_cleared()
+
+    def _emit(self, direction, length, score, food, tick_rate):
+        """Fire the tracker hooks for whatever changed during this tick."""
+        tr, snake = self.tracker, self.snake
+        if tr.on_turn and snake.direction != direction:
+            tr.on_turn(self)
+        if tr.on_wall:
+            x, y = snake.head
+            if (x < WALL_BAND or y < WALL_BAND
+                    or x >= self.cols - WALL_BAND or y >= self.rows - WALL_BAND):
+                tr.on_wall(self)
+        if tr.on_grow and snake.length != length:
+            tr.on_grow(self)
+        if tr.on_overlap and snake.body.overlaps:
+            tr.on_overlap(self)
+        if tr.on_speed and self.tick_rate != tick_rate:
+            tr.on_speed(self)
+        if tr.on_eat and self.score != score:
+            tr.on_eat(self)
+        if tr.on_spawn and self.food.position != food:
+            tr.on_spawn(self)
+        if self.frame >= tr.wake_at:
+            tr.wake_at = NEVER
+            tr.on_timer(self)
+
+    # ── food collision ─────────────────────────────────────────────
+    def _check_food(self):
+        head_pos = self._to_screen(self.snake.head)
+        food_pos = self.food.position
+        if head_pos == food_pos:
+            self.score += 1
+            self.snake.grow()
+            if not self.food.spawn(self.snake.body[:1]):
+                self.board_full = True
+                self.alive = False
+                return
+            self._on_food_eaten()
+
+    # ── speed scaling ──────────────────────────────────────────────
+    def _update_speed(self):
+        self.tick_rate = INITIAL_SPEED + self.frame // 30
+
+    # ── hooks (overridden by the front-end) ────────────────────────
+    def _on_stage_cleared(self):
+        pass
+
+    def _on_food_eaten(self):
+        pass
+
+    # ── headless driving ───────────────────────────────────────────
+    @property
+    def running(self) -> bool:
+        return self.alive and (self.endless or not self.all_fixed)
+
+    def step(self, move=None) -> bool:
+        """Apply *move* (optional), advance one tick.  Returns ``running``.
+
+        *move* is a direction name, steered like a key press, or a
+        direction vector, queued with ``turn``.
+        """
+        if isinstance(move, str):
+            self.steer(move)
+        elif move:
+            self.turn(move)
+        if self.running:
+            self._tick()
+        return self.running
+
+    def run(self, source=None, max_ticks: int = 100_000) -> int:
+        """Play until game over, all stages fixed (unless ``endless``) or
+        *max_ticks*.
+
+        *source* is called with the engine before every tick and returns a
+        move for ``step`` or ``None``.  Returns the number of ticks played.
+        """
+        start = self.frame
+        while self.running and self.frame - start < max_ticks:
+            self.step(source(self) if source else None)
+        return self.frame - start
@@ -0,0 +1,278 @@
+"""Snake Bug Quest — gym-style environment API over the Engine.
+
+    from env import SnakeEnv
+    env = SnakeEnv()
+    obs, info = env.reset(seed=1)
+    obs, reward, terminated, truncated, info = env.step(3)     # right
+
+Actions are direction codes in ``replay.NAMES`` order (0 = up, 1 = down,
+2 = left, 3 = right) or -1 to keep going.  By default the game follows
+the rules as designed, played by a one-game ``batch.BatchEngine``;
+``rules="shipped"`` plays the package's own ``Engine`` instead, bugs and
+stage detectors included, in ``endless`` mode so clearing stages does
+not end an episode.  Either way an episode ends only when the snake dies
+or fills the board, and actions go in as direction vectors, never
+through the key mapping.  The observation is a (3, rows, cols) uint8
+board — snake, head and food channels — kept up to date in one buffer;
+every call returns a view of that same buffer, so copy it to keep an
+earlier frame.
+
+``VectorEnv`` runs many environments across worker processes that write
+their boards straight into one ``multiprocessing.shared_memory`` block:
+only actions, rewards and flags travel through the pipes.  Needs NumPy
+(``pip install numpy``); the API follows Gymnasium's signatures without
+depending on it.
+"""
+
+import multiprocessing as mp
+import os
+from multiprocessing import shared_memory
+
+try:
+    import numpy as np
+except ImportError:
+    raise ImportError("env.py needs NumPy: pip install numpy") from None
+
+from config import GRID_COLS, GRID_ROWS, RANDOM_SEED, DIR_UP, DIR_DOWN, DIR_LEFT, DIR_RIGHT
+from batch import BatchEngine
+from engine import Engine
+from replay import NAMES
+
+SNAKE, HEAD, FOOD = 0, 1, 2          # observation channels
+NO_TURN = -1
+MAX_STEPS = 10_000                   # ticks before an episode is truncated
+RULES = ("designed", "shipped")
+DIRECTIONS = (DIR_UP, DIR_DOWN, DIR_LEFT, DIR_RIGHT)     # by action code
+
+
+class SnakeEnv:
+    """One game behind ``reset(seed)`` / ``step(action)``.
+
+    Reward is +1 per food eaten and -1 for dying.  *rules* is
+    ``"designed"`` (a ``BatchEngine`` of one) or ``"shipped"`` (an
+    ``Engine`` starting on *stage*).  *buffer*, if given, is the
+    (3, rows, cols) uint8 array to keep the observation in (``VectorEnv``
+    passes a slice of shared memory).
+    """
+
+    n_actions = len(NAMES)
+
+    def __init__(self, stage: int = 1, cols: int = GRID_COLS, rows: int = GRID_ROWS,
+                 max_steps: int = MAX_STEPS, buffer=None, rules: str = "designed"):
+        if rules not in RULES:
+            raise ValueError(f"rules must be one of {RULES}, not {rules!r}")
+        self.stage = stage
+        self.cols, self.rows = cols, rows
+        self.max_steps = max_steps
+        self.rules = rules
+        self.observation_shape = (3, rows, cols)
+        self.obs = np.zeros(self.observation_shape, np.uint8) if buffer is None else buffer
+        self.engine = None                # the Engine or BatchEngine playing
+        self.seed = None
+        self._head = self._food = None
+
+    # ── gym API ────────────────────────────────────────────────────
+    def reset(self, seed=None):
+        """Start a new game with food seed *seed*; returns ``(obs, info)``."""
+        seed = self.seed = RANDOM_SEED if seed is None else seed
+        if self.rules == "designed":
+            return self._reset_batch(seed)
+        e = self.engine
+        if e is None:
+            e = self.engine = Engine(self.stage, seed, cols=self.cols, rows=self.rows,
+                                     endless=True)
+        else:
+            e.stage, e.seed = self.stage, seed
+            e._new_game()
+        self.obs[:] = 0
+        for cell in e.snake.body:
+            self._mark(SNAKE, cell, 1)
+        self._head = e.snake.head
+        self._mark(HEAD, self._head, 1)
+        self._food = e.food.position
+        self._mark(FOOD, self._food, 1)
+        return self.obs, self._info()
+
+    def step(self, action):
+        """Steer by *action* and play one tick.
+
+        Returns ``(obs, reward, terminated, truncated, info)``.
+        """
+        if self.rules == "designed":
+            return self._step_batch(action)
+        e = self.engine
+        score, frame = e.score, e.frame
+        e.step(DIRECTIONS[action] if action is not None and action >= 0 else None)
+        if e.frame != frame:
+            self._update()
+        terminated = not e.alive                 # dead, or the board is full
+        reward = e.score - score - (not e.alive and not e.board_full)
+        truncated = not terminated and e.frame >= self.max_steps
+        return self.obs, float(reward), terminated, truncated, self._info()
+
+    # ── designed rules ─────────────────────────────────────────────
+    def _reset_batch(self, seed):
+        b = self.engine
+        if b is None:
+            b = self.engine = BatchEngine(1, self.cols, self.rows, seed)
+        else:
+            b.rng = np.random.default_rng(seed)
+            b.reset()
+        self.obs[:] = 0
+        self._head = self._food = None
+        self._update_batch()
+        return self.obs, self._info()
+
+    def _step_batch(self, action):
+        b = self.engine
+        was_alive = bool(b.alive[0])
+        eaten, _ = b.step(np.array([NO_TURN if action is None else action], np.int8))
+        if was_alive:
+            self._update_batch()
+        terminated = not b.alive[0]
+        reward = int(eaten[0]) - (was_alive and terminated and not b.board_full[0])
+        truncated = not terminated and b.steps[0] >= self.max_steps
+        return self.obs, float(reward), terminated, truncated, self._info()
+
+    def _update_batch(self):
+        """Copy the occupancy grid; move the head and food marks."""
+        b = self.engine
+        np.copyto(self.obs[SNAKE], b.grids[0])
+        head = tuple(int(v) for v in b.xy(b.head[0]))
+        food = tuple(int(v) for v in b.xy(b.food[0])) if b.food[0] >= 0 else None
+        if head != self._head:
+            self._mark(HEAD, self._head, 0)
+            self._mark(HEAD, head, 1)
+            self._head = head
+        if food != self._food:
+            self._mark(FOOD, self._food, 0)
+            self._mark(FOOD, food, 1)
+            self._food = food
+
+    # ── observation ────────────────────────────────────────────────
+    def _update(self):
+        """Repaint only the cells the last tick changed."""
+        snake, food = self.engine.snake, self.engine.food.position
+        head = snake.head
+        if head != self._head:
+            self._mark(HEAD, self._head, 0)
+            self._mark(SNAKE, head, 1)
+            self._mark(HEAD, head, 1)
+            self._head = head
+        if snake.vacated is not None and not snake.body.count(snake.vacated):
+            self._mark(SNAKE, snake.vacated, 0)
+        if food != self._food:
+            self._mark(FOOD, self._food, 0)
+            self._mark(FOOD, food, 1)
+            self._food = food
+
+    def _mark(self, channel, cell, value):
+        if cell is not None:
+            x, y = cell
+            if 0 <= x < self.cols and 0 <= y < self.rows:
+                self.obs[channel, y, x] = value
+
+    def _info(self):
+        e = self.engine
+        if self.rules == "designed":
+            return {"score": int(e.score[0]), "frame": int(e.steps[0]),
+                    "length": int(e.length[0])}
+        return {"score": e.score, "stage": e.stage, "frame": e.frame,
+                "length": e.snake.length}
+
+
+# ── vector env ─────────────────────────────────────────────────────
+def _worker(conn, shm_name, shape, lo, hi, kwargs):
+    """Serve envs ``lo..hi-1`` of a VectorEnv, observations in shared memory."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    obs = np.ndarray(shape, np.uint8, buffer=shm.buf)
+    envs = [SnakeEnv(buffer=obs[i], **kwargs) for i in range(lo, hi)]
+    try:
+        while True:
+            cmd, arg = conn.recv()
+            if cmd == "reset":
+                conn.send([env.reset(seed)[1] for env, seed in zip(envs, arg)])
+            elif cmd == "step":
+                out = []
+                for env, action in zip(envs, arg):
+                    _, reward, terminated, truncated, info = env.step(action)
+                    if terminated or truncated:            # auto-reset, keep the final info
+                        info["final"] = dict(info)
+                        env.reset(env.seed + shape[0])
+                    out.append((reward, terminated, truncated, info))
+                conn.send(out)
+            else:
+                break
+    finally:
+        del obs, envs
+        shm.close()
+        conn.close()
+
+
+class VectorEnv:
+    """*n* SnakeEnvs in worker processes, boards in shared memory.
+
+    ``obs`` is an (n, 3, rows, cols) uint8 array over the shared block;
+    ``step`` returns it (not a copy) with reward/terminated/truncated
+    arrays.  Env *i* starts with seed ``seed + i`` and each restart adds
+    *n*; a finished game restarts at once, its last info kept under
+    ``info["final"]``.  Use as a context manager or ``close()``.
+    """
+
+    def __init__(self, n: int, workers: int = None, stage: int = 1,
+                 cols: int = GRID_COLS, rows: int = GRID_ROWS, max_steps: int = MAX_STEPS,
+                 rules: str = "designed"):
+        self.n = n
+        self.observation_shape = (3, rows, cols)
+        shape = (n,) + self.observation_shape
+        self._shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)))
+        self.obs = np.ndarray(shape, np.uint8, buffer=self._shm.buf)
+        kwargs = {"stage": stage, "cols": cols, "rows": rows, "max_steps": max_steps,
+                  "rules": rules}
+        workers = max(1, min(n, workers or os.cpu_count() or 1))
+        bounds = [n * w // workers for w in range(workers + 1)]
+        self._slices = list(zip(bounds, bounds[1:]))
+        self._conns, self._procs = [], []
+        for lo, hi in self._slices:
+            parent, child = mp.Pipe()
+            p = mp.Process(target=_worker, daemon=True,
+                           args=(child, self._shm.name, shape, lo, hi, kwargs))
+            p.start()
+            child.close()
+            self._conns.append(parent)
+            self._procs.append(p)
+
+    def _call(self, cmd, args):
+        for conn, (lo, hi) in zip(self._conns, self._slices):
+            conn.send((cmd, args[lo:hi]))
+        return [r for conn in self._conns for r in conn.recv()]
+
+    def reset(self, seed: int = RANDOM_SEED):
+        """Reset env *i* with seed ``seed + i``; returns ``(obs, infos)``."""
+        return self.obs, self._call("reset", [seed + i for i in range(self.n)])
+
+    def step(self, actions):
+        """Returns ``(obs, rewards, terminated, truncated, infos)``."""
+        out = self._call("step", [int(a) for a in actions])
+        rewards = np.array([r[0] for r in out], np.float32)
+        terminated = np.array([r[1] for r in out], bool)
+        truncated = np.array([r[2] for r in out], bool)
+        return self.obs, rewards, terminated, truncated, [r[3] for r in out]
+
+    def close(self):
+        if self._shm is None:
+            return
+        for conn in self._conns:
+            conn.send(("close", None))
+        for p in self._procs:
+            p.join()
+        del self.obs
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
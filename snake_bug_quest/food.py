@@ -1,21 +1,59 @@
 """Snake Bug Quest — food spawning."""
 
 import random
-from config import GRID_COLS, GRID_ROWS
+from config import GRID_COLS, GRID_ROWS, SPAWN_TRIES
+from board import free_cells
 
 
 class Food:
     """Single food pellet on the grid."""
 
-    def __init__(self, seed: int = 42):
+    def __init__(self, seed: int = 42, cols: int = GRID_COLS, rows: int = GRID_ROWS):
         self.rng = random.Random(seed)
+        self.cols, self.rows = cols, rows
         self.position = (0, 0)
+        self._rng_state = None    # rng.getstate() cached until the next draw
 
-    def spawn(self, occupied):
-        """Place food on a random cell that is not in *occupied*."""
-        while True:
-            pos = (self.rng.randint(0, GRID_COLS - 1),
-                   self.rng.randint(0, GRID_ROWS - 1))
-            if pos not in occupied:
-                break
-        self.position = pos
+    def spawn(self, occupied) -> bool:
+        """Place food on a random cell that is not in *occupied*.
+
+        Uses the snake body's free-cell index when *occupied* has one, so a
+        spawn is a single random pick.  Any other iterable gets up to
+        SPAWN_TRIES random picks while it covers under half the board, and
+        only then an index of its own.  Returns False (and clears
+        ``position``) when every cell is occupied.
+        """
+        free = getattr(occupied, "free", None)
+        if free is None:
+            taken = occupied if isinstance(occupied, (set, frozenset, dict)) else set(occupied)
+            cols, rows = self.cols, self.rows
+            if 2 * len(taken) < cols * rows:
+                for _ in range(SPAWN_TRIES):
+                    cell = (self.rng.randrange(cols), self.rng.randrange(rows))
+                    if cell not in taken:
+                        self._rng_state = None
+                        self.position = cell
+                        return True
+            free = free_cells(cols, rows)
+            for cell in taken:
+                free.discard(cell)
+        if not free:
+            self.position = None
+            return False
+        self._rng_state = None
+        self.position = free.choice(self.rng)
+        return True
+
+    # ── snapshots ──────────────────────────────────────────────────
+    def snapshot(self):
+        """(position, rng state); the state object is reused until the
+        rng is drawn from again, so snapshots between spawns share it."""
+        if self._rng_state is None:
+            self._rng_state = self.rng.getstate()
+        return self.position, self._rng_state
+
+    def restore(self, snap):
+        self.position, state = snap
+        if state is not self._rng_state:
+            self.rng.setstate(state)
+            self._rng_state = state
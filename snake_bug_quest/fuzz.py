@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""Snake Bug Quest — fuzzer for the stage detectors.
+
+Plays large numbers of generated games headlessly on all cores and flags
+two kinds of detector mistakes:
+
+    false positive  the stage is cleared on the *buggy* variant, where its
+                    bug is still present
+    false negative  on the *fixed* variant the run plainly met the stage's
+                    goal (see ``Goals``) but the stage never cleared
+
+Every game is reproducible from its case number.  Cases mix a starting
+stage, a food seed and an input policy: random key mashing or one of the
+adversarial ones that hug the bottom wall, spam LEFT, coil into the body
+or chase food.  The shortest failures of each kind are shrunk (turns
+removed while the failure persists, trace cut at the failing tick) and
+saved as ``replay`` recordings.
+
+A participant on stage N has fixed bugs 1..N-1 already, and earlier bugs
+can hide a detector's mistakes: on the shipped tree some stages' goals
+may be unreachable.  Pass such trees per stage with ``--buggy N=PATH``;
+stages without one use the fully buggy tree.
+
+    python fuzz.py --fixed /path/to/solution -n 1000000
+    python fuzz.py --buggy 6=/path/to/tree-on-stage-6 -n 100000
+    python regression.py --traces fuzz-failures --variant buggy=.   # replay them
+"""
+
+import argparse, os, random, sys, time
+from concurrent.futures import ProcessPoolExecutor
+
+from config import GRID_COLS, GRID_ROWS, RANDOM_SEED, TOTAL_STAGES, WALL_BAND
+from replay import Recording, play
+from regression import load_variant
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CHUNK = 2000        # cases per pool task
+SHRINK = 3          # failures shrunk and saved per (kind, stage)
+MOVES = {"up": (0, -1), "down": (0, 1), "left": (-1, 0), "right": (1, 0)}
+NAMES = tuple(MOVES)
+
+
+# ── input policies: policy(rng) → press(game) → names pressed this tick ─
+def mash(rng):
+    """Random presses, 1-3 per tick at a random rate."""
+    rate = rng.uniform(0.05, 0.6)
+
+    def press(g):
+        if rng.random() >= rate:
+            return ()
+        return rng.choices(NAMES, k=rng.randint(1, 3))
+    return press
+
+
+def left_spam(rng):
+    """LEFT over and over, with the occasional up/down to make it legal."""
+    def press(g):
+        if rng.random() < 0.3:
+            return (rng.choice(("up", "down")), "left")
+        return ("left",) if rng.random() < 0.7 else ()
+    return press
+
+
+def hug_bottom(rng):
+    """Head for the bottom rows, run along them and poke at the wall."""
+    poke = rng.uniform(0.0, 0.4)
+
+    def press(g):
+        x, y = g.snake.head
+        d = g.snake.direction
+        if y < GRID_ROWS - WALL_BAND:
+            return ("down",)
+        if rng.random() < poke:
+            return ("down",)
+        if d[1]:
+            return ("left",) if x > GRID_COLS // 2 else ("right",)
+        if x <= 1 and d == MOVES["left"]:
+            return ("up", "right")
+        if x >= GRID_COLS - 2 and d == MOVES["right"]:
+            return ("up", "left")
+        return ()
+    return press
+
+
+def coil(rng):
+    """Turn the same way every few ticks, spiralling into the body."""
+    order = ("up", "right", "down", "left")
+    turn = rng.choice((1, 3))                   # clockwise or counter-clockwise
+    every = rng.randint(1, 5)
+
+    def press(g):
+        if g.frame % every:
+            return ()
+        i = next((i for i, n in enumerate(order) if MOVES[n] == g.snake.direction), 0)
+        return (order[(i + turn) % 4],)
+    return press
+
+
+def chase(rng):
+    """Greedy toward the food, avoiding walls and the body most of the time."""
+    care = rng.uniform(0.5, 1.0)
+
+    def press(g):
+        food = g.food.position
+        if food is None:
+            return ()
+        x, y = g.snake.head
+        best = []
+        for name, (dx, dy) in MOVES.items():
+            nx, ny = x + dx, y + dy
+            if rng.random() < care and (not (0 <= nx < GRID_COLS and 0 <= ny < GRID_ROWS)
+                                        or (nx, ny) in g.snake.body):
+                continue
+            best.append((abs(nx - food[0]) + abs(ny - food[1]), rng.random(), name))
+        return (min(best)[2],) if best else ()
+    return press
+
+
+POLICIES = (mash, left_spam, hug_bottom, coil, chase)
+
+
+# ── stage goals (reference for false negatives) ─────────────────────
+class Goals:
+    """Tracks, tick by tick, whether the current stage's goal has been met.
+
+    These restate each stage's criterion plainly, with no shortcuts, so a
+    fixed game that meets one and still does not clear the stage points at
+    the detector.  ``met_at`` is the frame where the goal was first met.
+    """
+
+    def __init__(self, g):
+        self.stage = g.stage
+        self.met_at = None
+        self._score = g.score
+        self._eats = 0
+        self._last_eat = None
+        self._bottom = 0
+        self._long_since = None
+
+    def update(self, g):
+        if self.met_at is not None or g.stage != self.stage or not g.alive:
+            return
+        ate = g.score != self._score
+        self._score = g.score
+        if ate:
+            self._eats += 1
+            self._last_eat = g.frame
+        s = self.stage
+        if s == 1:
+            met = g.snake.direction == MOVES["left"]
+        elif s == 2:
+            met = ate and g.food.position is not None
+        elif s == 3:
+            met = self._last_eat is not None and g.frame - self._last_eat >= 10
+        elif s == 4:
+            met = self._eats >= 3
+        elif s == 5:
+            met = g.score >= 8 and g.frame >= 62
+        elif s == 6:
+            if g.snake.head[1] >= GRID_ROWS - WALL_BAND:
+                self._bottom += 1
+            met = self._bottom >= 2 and g.frame >= 41
+        else:
+            if g.snake.length > 5:
+                if self._long_since is None:
+                    self._long_since = g.frame
+            else:
+                self._long_since = None
+            met = self._long_since is not None and g.frame - self._long_since >= 81
+        if met:
+            self.met_at = g.frame
+
+
+# ── running cases (inside the worker processes) ─────────────────────
+def _case(i):
+    """(stage, seed, policy) for case *i*, derived from *i* alone."""
+    rng = random.Random(i)
+    stage = rng.randint(1, TOTAL_STAGES)
+    seed = RANDOM_SEED if rng.random() < 0.25 else rng.randrange(1 << 16)
+    policy = rng.choice(POLICIES)(rng)
+    return stage, seed, policy
+
+
+def _play_case(make, case, max_ticks):
+    """Play *case*; returns (recording, first clear frame, goal frame)."""
+    stage, seed, press = case
+    g = make(stage, seed)
+    rec = Recording(stage, seed)
+    goals = Goals(g)
+    cleared = None
+    while g.running and g.frame < max_ticks:
+        for name in press(g):
+            rec.add(g.frame, name)
+            g.steer(name)
+        g._tick()
+        goals.update(g)
+        if cleared is None and g.stage != stage:
+            cleared = g.frame
+    rec.ticks = g.frame
+    return rec, cleared, goals.met_at
+
+
+def _failure(kind, cleared, met_at):
+    """The frame a run fails at for *kind* ("fp"/"fn"), or None if it passes."""
+    if kind == "fp":
+        return cleared
+    if met_at is not None and cleared is None:
+        return met_at
+    return None
+
+
+def _fuzz_chunk(task):
+    """Play the cases in [start, start + count) that begin on *stages*."""
+    kind, path, stages, start, count, max_ticks = task
+    make = load_variant(path)
+    failures = []
+    games = ticks = 0
+    for i in range(start, start + count):
+        case = _case(i)
+        if case[0] not in stages:
+            continue
+        rec, cleared, met_at = _play_case(make, case, max_ticks)
+        games += 1
+        ticks += rec.ticks
+        at = _failure(kind, cleared, met_at)
+        if at is not None:
+            failures.append((kind, rec.stage, i, at))
+    return failures, games, ticks
+
+
+def _fails(make, kind, rec):
+    """Replay *rec*; the failing frame if it still fails as *kind*, else None."""
+    g = make(rec.stage, rec.seed)
+    goals = Goals(g)
+    cleared = None
+
+    def watch(g):
+        nonlocal cleared
+        goals.update(g)
+        if cleared is None and g.stage != rec.stage:
+            cleared = g.frame
+
+    play(rec, watch, engine=g)
+    return _failure(kind, cleared, goals.met_at)
+
+
+def _shrink_case(task):
+    """Re-play case *i* and shrink it to a minimal failing recording."""
+    kind, path, i, max_ticks = task
+    make = load_variant(path)
+    rec, cleared, met_at = _play_case(make, _case(i), max_ticks)
+    at = _failure(kind, cleared, met_at)
+    rec = Recording(rec.stage, rec.seed, [e for e in rec.events if e[0] < at], at)
+    events = rec.events
+    # ddmin-style: drop ever smaller runs of turns while the failure holds
+    n = 2
+    while events:
+        size = max(1, len(events) // n)
+        for lo in range(0, len(events), size):
+            trial = events[:lo] + events[lo + size:]
+            at = _fails(make, kind, Recording(rec.stage, rec.seed, trial, rec.ticks))
+            if at is not None:
+                events = trial
+                rec.ticks = at
+                n = max(n - 1, 2)
+                break
+        else:
+            if size == 1:
+                break
+            n = min(n * 2, len(events))
+    rec.events = events
+    # bytes: the variant may have re-imported ``replay`` in this process
+    return kind, i, rec.to_bytes()
+
+
+# ── driver ─────────────────────────────────────────────────────────
+def fuzz(buggy, fixed, cases, max_ticks=600, jobs=None, first=0):
+    """Play cases ``first .. first + cases - 1``; returns (failures, games, ticks, shrunk).
+
+    *buggy* maps each stage to the variant its false positives are looked
+    for on (the tree a participant has on that stage); *fixed* is an
+    all-fixed variant, or None to skip false negatives.  *failures* holds
+    ``(kind, stage, case, frame)`` tuples; *shrunk* maps ``(kind, stage)``
+    to a few minimal ``(case, Recording)`` pairs.
+    """
+    variants = {}
+    for stage, path in buggy.items():
+        variants.setdefault(("fp", path), set()).add(stage)
+    if fixed:
+        variants["fn", fixed] = set(range(1, TOTAL_STAGES + 1))
+    tasks = [(kind, path, stages, lo, min(CHUNK, first + cases - lo), max_ticks)
+             for (kind, path), stages in variants.items()
+             for lo in range(first, first + cases, CHUNK)]
+    failures, games, ticks = [], 0, 0
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for found, g, t in pool.map(_fuzz_chunk, tasks):
+            failures += found
+            games += g
+            ticks += t
+        picks = {}
+        for kind, stage, i, at in sorted(failures, key=lambda f: f[3]):
+            chosen = picks.setdefault((kind, stage), [])
+            if len(chosen) < SHRINK:
+                chosen.append(i)
+        tasks = [(kind, buggy[stage] if kind == "fp" else fixed, i, max_ticks)
+                 for (kind, stage), chosen in picks.items() for i in chosen]
+        shrunk = {}
+        for kind, i, data in pool.map(_shrink_case, tasks):
+            rec = Recording.from_bytes(data)
+            shrunk.setdefault((kind, rec.stage), []).append((i, rec))
+    return failures, games, ticks, shrunk
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Fuzz the stage detectors")
+    ap.add_argument("--buggy", action="append", metavar="[STAGE=]PATH",
+                    help="variant to look for false positives on, for every stage "
+                         "or just STAGE (repeatable; default: this tree)")
+    ap.add_argument("--fixed", help="variant with every bug fixed (enables false-negative checks)")
+    ap.add_argument("-n", "--cases", type=int, default=100_000, help="cases to play")
+    ap.add_argument("--first", type=int, default=0, help="first case number")
+    ap.add_argument("--max-ticks", type=int, default=600, help="tick limit per game")
+    ap.add_argument("-j", "--jobs", type=int, help="worker processes (default: all cores)")
+    ap.add_argument("--out", default="fuzz-failures", help="where shrunk failures are saved")
+    args = ap.parse_args()
+
+    default, staged = HERE, {}
+    for spec in args.buggy or ():
+        stage, _, path = spec.rpartition("=")
+        if stage:
+            staged[int(stage)] = os.path.abspath(path)
+        else:
+            default = os.path.abspath(path)
+    buggy = {s: staged.get(s, default) for s in range(1, TOTAL_STAGES + 1)}
+    fixed = args.fixed and os.path.abspath(args.fixed)
+
+    t0 = time.perf_counter()
+    failures, games, ticks, shrunk = fuzz(buggy, fixed, args.cases,
+                                          args.max_ticks, args.jobs, args.first)
+    secs = time.perf_counter() - t0
+    print(f"{games} games, {ticks} ticks in {secs:.1f} s "
+          f"({games / secs:.0f} games/s, {ticks / secs:.0f} ticks/s)")
+
+    for kind, label in (("fp", "false positives"), ("fn", "false negatives")):
+        if kind == "fn" and not fixed:
+            continue
+        counts = {}
+        for k, stage, _, _ in failures:
+            if k == kind:
+                counts[stage] = counts.get(stage, 0) + 1
+        print(f"{label}: " + (", ".join(f"stage {s}: {n}" for s, n in sorted(counts.items()))
+                              or "none"))
+    if shrunk:
+        os.makedirs(args.out, exist_ok=True)
+    for (kind, stage), found in sorted(shrunk.items()):
+        for i, rec in found:
+            path = os.path.join(args.out, f"{kind}-stage{stage}-case{i}.sbqr")
+            rec.save(path)
+            print(f"  {path}: {len(rec.events)} turns, fails at tick {rec.ticks}")
+    sys.exit(1 if failures else 0)
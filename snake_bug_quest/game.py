@@ -1,76 +1,208 @@
-"""Snake Bug Quest — game state, loop, and rendering."""
+"""Snake Bug Quest — game loop, input, and rendering."""
+
+import os, time
+from time import perf_counter_ns
 
 import pygame
 
 from config import (
-    CELL_SIZE, GRID_COLS, GRID_ROWS,
-    GAME_AREA_WIDTH, WINDOW_WIDTH, WINDOW_HEIGHT, PANEL_WIDTH,
-    BG_COLOR, GRID_COLOR, SNAKE_COLOR, SNAKE_HEAD_COLOR,
-    FOOD_COLOR, PANEL_BG, TEXT_COLOR, HIGHLIGHT,
-    STAGE_CLR, GAMEOVER_CLR, WIN_CLR,
-    INITIAL_SPEED, SPEED_INCREMENT, SPEED_SCORE_INTERVAL, SPEED_CAP,
-    RANDOM_SEED, TOTAL_STAGES,
-    KEY_TO_NAME, NAME_TO_DIR,
-    DIR_LEFT, STAGE_HINTS,
+    GRID_COLS, GRID_ROWS,
+    WINDOW_WIDTH, WINDOW_HEIGHT, RENDER_FPS, MAX_TICKS_PER_FRAME,
+    HUD_REFRESH, PROFILE_TRACE, KEY_TO_NAME,
+    AUTOPILOT_IDLE, AUTOPILOT_RESTART,
 )
-from snake import Snake
-from food import Food
-from bug_tracker import BugTracker
-from progress import load_progress, save_progress, reset_progress
+from autopilot import Autopilot, stage_goal
+from engine import Engine
+from profiler import FrameProfiler
+from renderer import Renderer
+from rewind import Timeline
+import log
+import progress as single_player
 
 
-class Game:
-    """Top-level game controller."""
+class Game(Engine):
+    """Top-level game controller: pygame window on top of the Engine."""
 
-    def __init__(self):
+    def __init__(self, progress=None, record_dir=None, profile=None,
+                 cols=GRID_COLS, rows=GRID_ROWS, autopilot=False):
+        """*progress* provides load/save/reset/flush_progress; defaults to
+        the single-player ``progress`` module (``progress.json``).  With
+        *record_dir*, every game is saved there as a ``replay`` recording.
+        With *profile* (a path) the profiler HUD starts shown and the frame
+        trace is written there on exit.  *cols* × *rows* larger than the
+        default board is marathon mode: the view scrolls with the head.
+        With *autopilot* the game plays itself from the start (A toggles
+        it); it also takes over after AUTOPILOT_IDLE seconds without a
+        key, until the next key press, but only during a live game in a
+        focused window — a game-over screen or a window left for the
+        editor means a participant is busy fixing code."""
+        self.progress = progress or single_player
+        self.record_dir = record_dir
+        self._games = 0
         pygame.init()
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption("Snake Bug Quest 🐍🐛")
         self.clock = pygame.time.Clock()
         self.font = pygame.font.SysFont("monospace", 16)
         self.big_font = pygame.font.SysFont("monospace", 28, bold=True)
-        self.stage = load_progress()
-        self._new_game()
-
-    def _new_game(self):
-        self.snake = Snake()
-        self.food = Food(seed=RANDOM_SEED)
-        self.food.spawn(self.snake.body)
-        self.score = 0
-        self.tick_rate = INITIAL_SPEED
-        self.alive = True
-        self.frame = 0
-        self._last_speedup = 0
-        self.tracker = BugTracker(self.stage)
-        self.all_fixed = self.stage > TOTAL_STAGES
-
-    # ── coordinate helpers (used by renderer + collision) ──────────
-    @staticmethod
-    def _to_screen(cell):
-        """Grid cell → pixel coordinate (top-left corner)."""
-        return (cell[0] * CELL_SIZE, cell[1] * CELL_SIZE)
+        self.renderer = Renderer(self.screen, self.font, self.big_font)
+        self.profiler = self.renderer.profiler = FrameProfiler()
+        self.profile_path = profile
+        self.show_hud = profile is not None
+        self.dropped_ticks = 0
+        self.timeline = Timeline()
+        self.autopilot = Autopilot(stage_goal) if autopilot else None
+        self._idle = False            # autopilot started by the idle timer
+        self._last_key = time.perf_counter()
+        super().__init__(stage=self.progress.load_progress(),
+                         record=record_dir is not None, cols=cols, rows=rows)
 
     # ── main loop ──────────────────────────────────────────────────
     def run(self):
+        """Fixed-timestep loop: ticks at ``tick_rate``, input + drawing at RENDER_FPS."""
         running = True
+        lag = 0.0
+        last = time.perf_counter()
+        prof = self.profiler
+        frames = 0
         while running:
-            for ev in pygame.event.get():
+            t = perf_counter_ns()
+            events = pygame.event.get()
+            stamp = time.perf_counter()         # when these keys reached the game
+            for ev in events:
                 if ev.type == pygame.QUIT:
                     running = False
                 elif ev.type == pygame.KEYDOWN:
-                    running = self._on_key(ev.key)
-            if self.alive and not self.all_fixed:
+                    running = self._on_key(ev.key, stamp)
+                elif ev.type in (pygame.WINDOWFOCUSGAINED, pygame.WINDOWFOCUSLOST):
+                    self._last_key = stamp           # the idle time starts over
+            prof.add("input", t)
+
+            now = time.perf_counter()
+            lag += now - last
+            last = now
+            if (self.autopilot is None and now - self._last_key >= AUTOPILOT_IDLE
+                    and self.running and pygame.key.get_focused()):
+                self._start_autopilot(idle=True)
+            if self.autopilot and not self.running and not self.timeline.rewound:
+                if self._ended_at is None:
+                    self._ended_at = now
+                elif now - self._ended_at >= AUTOPILOT_RESTART:
+                    self._new_game()
+            ticks = 0
+            while self.running and lag >= 1.0 / self.tick_rate:
+                lag -= 1.0 / self.tick_rate
+                t = perf_counter_ns()
+                if self.autopilot:
+                    move = self.autopilot(self)
+                    if move:
+                        self.turn(move)
                 self._tick()
-            self._draw()
-            self.clock.tick(self.tick_rate if self.alive else 15)
+                prof.add("tick", t)
+                ticks += 1
+                if ticks == MAX_TICKS_PER_FRAME:
+                    dropped = int(lag * self.tick_rate)
+                    if dropped:
+                        self.dropped_ticks += dropped
+                        prof.mark("dropped ticks", count=dropped)
+                    lag = 0.0
+                    break
+            if not self.running:
+                lag = 0.0
+
+            frames += 1
+            if self.show_hud and frames % HUD_REFRESH == 0:
+                self.renderer.hud = prof.hud_lines(self.dropped_ticks)
+            t = perf_counter_ns()
+            self._draw(min(lag * self.tick_rate, 1.0))
+            t = prof.add("draw", t)
+            self.clock.tick(RENDER_FPS if self.running else 15)
+            prof.add("sleep", t)
+        self._save_recording()
+        if self.profile_path:
+            prof.dump(self.profile_path).join()
+        self.progress.flush_progress()
+        log.flush()
         pygame.quit()
 
+    def _new_game(self):
+        self._save_recording()
+        self.timeline.clear()
+        self._ended_at = None
+        super()._new_game()
+        if self.autopilot:
+            self.recording = None              # its turns are not key presses
+
+    def _start_autopilot(self, idle=False):
+        """Hand the snake to the autopilot; *idle* marks the attract demo."""
+        self._save_recording()                 # keep the inputs played so far
+        self.autopilot, self._idle = Autopilot(stage_goal), idle
+
+    @property
+    def running(self) -> bool:
+        # no ticks while a rewound frame is on screen
+        return super().running and not self.timeline.rewound
+
+    def _save_recording(self):
+        """Write the finished game's inputs to ``record_dir`` (between games)."""
+        rec = getattr(self, "recording", None)
+        if rec is None or not rec.ticks:
+            return
+        self._games += 1
+        path = os.path.join(self.record_dir,
+                            f"{time.strftime('%Y%m%d-%H%M%S')}-{self._games:03d}.sbqr")
+        try:
+            os.makedirs(self.record_dir, exist_ok=True)
+            rec.save(path)
+        except OSError as e:
+            log.warning("recording_failed", path=path, error=str(e))
+        self.recording = None
+
     # ── input ──────────────────────────────────────────────────────
-    def _on_key(self, key) -> bool:
+    def _on_key(self, key, stamp=None) -> bool:
+        """Handle a key press read from the event queue at *stamp*
+        (``time.perf_counter()``), which turns carry for ``input_lag``."""
+        self._last_key = stamp or time.perf_counter()
         if key == pygame.K_ESCAPE:
             return False
+        if self._idle:
+            # a visitor: the idle demo makes way for a fresh game
+            self.autopilot, self._idle = None, False
+            self.stage = self.progress.load_progress()
+            self._new_game()
+            return True
+        if key == pygame.K_a:
+            if self.autopilot:
+                self.autopilot = None
+            else:
+                self._start_autopilot()
+            return True
+        if key == pygame.K_F3:
+            self.show_hud = not self.show_hud
+            self.renderer.hud = self.profiler.hud_lines(self.dropped_ticks) if self.show_hud else None
+            return True
+        if key == pygame.K_F4:
+            path = self.profile_path or PROFILE_TRACE
+            self.profiler.dump(path)
+            log.info("frame_trace", path=path)
+            return True
+        if key in (pygame.K_LEFTBRACKET, pygame.K_RIGHTBRACKET):
+            if key == pygame.K_LEFTBRACKET:
+                self.timeline.back(self)
+            else:
+                self.timeline.forward(self)
+            self.renderer.invalidate()
+            return True
+        if self.autopilot:
+            self.autopilot = None                  # any other key takes over
+        if self.timeline.rewound:
+            # any other key resumes from the latest tick
+            self.timeline.live(self)
+            self.renderer.invalidate()
+            if key == pygame.K_SPACE:
+                return True
         if key == pygame.K_r:
-            reset_progress()
+            self.progress.reset_progress()
             self.stage = 1
             self._new_game()
             return True
@@ -83,140 +215,44 @@ class Game:
 
         name = KEY_TO_NAME.get(key)
         if name:
-            direction = NAME_TO_DIR.get(name)
-            if direction:
-                self.snake.set_direction(direction)
-                if name == "left":
-                    self.tracker.notify_left()
+            self.steer(name, stamp)
         return True
 
     # ── tick ───────────────────────────────────────────────────────
     def _tick(self):
-        self.frame += 1
-        self.alive = self.snake.update()
-        if not self.alive:
-            return
-        self._check_food()
-        self._update_speed()
-        if self.tracker.tick(self):
-            self.stage += 1
-            save_progress(self.stage)
-            if self.stage > TOTAL_STAGES:
-                self.all_fixed = True
-                print("[game] 🎉 ALL BUGS FIXED!")
-            else:
-                self.tracker = BugTracker(self.stage)
-                print(f"[game] ▶ stage {self.stage}")
-        if self.frame % 40 == 0:
-            print(
-                f"  dir={self.snake.direction} head={self.snake.head} "
-                f"food={self.food.position} len={self.snake.length} "
-                f"grow={self.snake.pending_growth} spd={self.tick_rate} "
-                f"score={self.score} stg={self.stage}"
-            )
-
-    # ── food collision ─────────────────────────────────────────────
-    def _check_food(self):
-        head_pos = self._to_screen(self.snake.head)
-        food_pos = self.food.position
-        if head_pos == food_pos:
-            self.score += 1
-            self.snake.grow()
-            self.food.spawn(self.snake.body[:1])
-            self.tracker.notify_spawn(self.food.position, self.snake.body)
-            print(f"[game] ate food  score={self.score}")
-
-    # ── speed scaling ──────────────────────────────────────────────
-    def _update_speed(self):
-        self.tick_rate = INITIAL_SPEED + self.frame // 30
+        before = self.timeline.state(self)
+        super()._tick()
+        self.timeline.record(self, before)
+        lag = self.snake.input_lag
+        if lag is not None and not self.autopilot:
+            # key read → this tick, for the HUD's lag row and the trace
+            d = int(lag * 1e9)
+            self.profiler.span("lag", perf_counter_ns() - d, d)
+        if self.alive and self.frame % 40 == 0 and log.enabled(log.DEBUG):
+            t = perf_counter_ns()
+            snake = self.snake
+            log.debug("status", dir=snake.direction, head=snake.head,
+                      food=self.food.position, len=snake.length,
+                      grow=snake.pending_growth, spd=self.tick_rate,
+                      score=self.score, stage=self.stage)
+            self.profiler.add("log", t)
 
-    # ════════════════════════════════ rendering ═════════════════════
-    def _draw(self):
-        self.screen.fill(BG_COLOR)
-        self._draw_grid()
-        self._draw_food()
-        self._draw_snake()
-        self._draw_panel()
-        if not self.alive:
-            self._overlay("GAME OVER", GAMEOVER_CLR, "SPACE to retry")
+    def _on_stage_cleared(self):
+        t = perf_counter_ns()
+        if not self._idle:                  # the idle demo's clears are not the player's
+            self.progress.save_progress(self.stage)
+        t = self.profiler.add("save", t)
         if self.all_fixed:
-            self._overlay("ALL BUGS FIXED ✅", WIN_CLR, "R = reset  |  ESC = exit")
-        pygame.display.flip()
-
-    def _draw_grid(self):
-        for x in range(0, GAME_AREA_WIDTH + 1, CELL_SIZE):
-            pygame.draw.line(self.screen, GRID_COLOR, (x, 0), (x, WINDOW_HEIGHT))
-        for y in range(0, WINDOW_HEIGHT + 1, CELL_SIZE):
-            pygame.draw.line(self.screen, GRID_COLOR, (0, y), (GAME_AREA_WIDTH, y))
-
-    def _draw_snake(self):
-        for i, cell in enumerate(self.snake.body):
-            color = SNAKE_HEAD_COLOR if i == 0 else SNAKE_COLOR
-            px, py = self._to_screen(cell)
-            rect = pygame.Rect(px + 1, py + 1, CELL_SIZE - 2, CELL_SIZE - 2)
-            pygame.draw.rect(self.screen, color, rect, border_radius=4)
-
-    def _draw_food(self):
-        px, py = self._to_screen(self.food.position)
-        rect = pygame.Rect(px + 2, py + 2, CELL_SIZE - 4, CELL_SIZE - 4)
-        pygame.draw.rect(self.screen, FOOD_COLOR, rect, border_radius=6)
-
-    def _draw_panel(self):
-        px = GAME_AREA_WIDTH
-        pygame.draw.rect(self.screen, PANEL_BG, (px, 0, PANEL_WIDTH, WINDOW_HEIGHT))
-        pygame.draw.line(self.screen, GRID_COLOR, (px, 0), (px, WINDOW_HEIGHT), 2)
-        x, y, gap = px + 14, 14, 22
-
-        def lbl(txt, c=TEXT_COLOR):
-            nonlocal y
-            self.screen.blit(self.font.render(txt, True, c), (x, y))
-            y += gap
-
-        lbl("=== BUG QUEST ===", HIGHLIGHT)
-        y += 4
-        stg = f"Stage: {self.stage}/{TOTAL_STAGES}" if not self.all_fixed else "ALL FIXED ✅"
-        lbl(stg, STAGE_CLR)
-        y += 4
-        lbl(f"Score:   {self.score}")
-        lbl(f"Dir:     {self.snake.direction}")
-        lbl(f"Head:    {self.snake.head}")
-        lbl(f"Food:    {self.food.position}")
-        lbl(f"Length:  {self.snake.length}")
-        lbl(f"Growth:  {self.snake.pending_growth}")
-        lbl(f"Speed:   {self.tick_rate} tps")
-        y += 10
-        hint = STAGE_HINTS.get(self.stage, "")
-        for part in self._wrap(hint, 26):
-            lbl(part, STAGE_CLR)
-        y += 16
-        lbl("Controls:", HIGHLIGHT)
-        for t in (" Arrows = move", " R = reset progress",
-                   " ESC = quit", " Space = restart"):
-            lbl(t)
-
-    def _overlay(self, title, color, subtitle):
-        s = pygame.Surface((GAME_AREA_WIDTH, WINDOW_HEIGHT), pygame.SRCALPHA)
-        s.fill((0, 0, 0, 150))
-        self.screen.blit(s, (0, 0))
-        t = self.big_font.render(title, True, color)
-        self.screen.blit(t, t.get_rect(center=(GAME_AREA_WIDTH // 2,
-                                                WINDOW_HEIGHT // 2 - 20)))
-        t2 = self.font.render(subtitle, True, TEXT_COLOR)
-        self.screen.blit(t2, t2.get_rect(center=(GAME_AREA_WIDTH // 2,
-                                                  WINDOW_HEIGHT // 2 + 20)))
-
-    @staticmethod
-    def _wrap(text, width):
-        if not text:
-            return []
-        words, lines, cur = text.split(), [], ""
-        for w in words:
-            test = f"{cur} {w}" if cur else w
-            if len(test) > width:
-                lines.append(cur)
-                cur = w
-            else:
-                cur = test
-        if cur:
-            lines.append(cur)
-        return lines
+            log.info("all_fixed", stage=self.stage)
+        else:
+            log.info("stage_cleared", stage=self.stage)
+        self.profiler.add("log", t)
+
+    def _on_food_eaten(self):
+        t = perf_counter_ns()
+        log.info("food_eaten", score=self.score, stage=self.stage)
+        self.profiler.add("log", t)
+
+    # ════════════════════════════════ rendering ═════════════════════
+    def _draw(self, alpha=None):
+        self.renderer.draw(self, alpha)
@@ -0,0 +1,107 @@
+"""Snake Bug Quest — Hamiltonian-cycle solver for full-board games.
+
+A snake that follows a closed tour through every cell can never trap
+itself, so it grows until the board is full — the way to exercise
+``Food.spawn`` near 100% fill, the self-collision check at full length
+and drawing a packed board:
+
+    from hamilton import CyclePilot
+    e = Engine(stage=TOTAL_STAGES + 1, endless=True)
+    e.run(CyclePilot().direction, max_ticks=1_000_000)
+
+``endless`` keeps the game going past the stage detectors, and the
+pilot's direction vectors go in through ``Engine.turn`` rather than the
+key mapping.  Once the game's bugs are fixed that plays until the board
+is full (``e.board_full``); as shipped the snake never gets to eat, so it
+circles the tour until *max_ticks*.
+
+The tour is precomputed once per board size; a board has one only if a
+side is even.  With *shortcuts* the pilot cuts across the tour toward
+the food while the snake is short, but only to cells further along the
+tour than its head and well short of its tail.  The body then still lies
+on one stretch of the tour behind the head, so the tour stays safe.
+"""
+
+from config import GRID_COLS, GRID_ROWS, DIR_UP, DIR_DOWN, DIR_LEFT, DIR_RIGHT
+
+NAMES = {DIR_UP: "up", DIR_DOWN: "down", DIR_LEFT: "left", DIR_RIGHT: "right"}
+
+
+def hamiltonian_cycle(cols: int = GRID_COLS, rows: int = GRID_ROWS):
+    """Cells of a closed tour visiting every cell of a *cols* × *rows* board once.
+
+    With an even row count the rows are swept right and left over columns
+    1..cols-1 and column 0 is the way back up; otherwise the same pattern
+    runs down and up the columns.  Raises ValueError when no tour exists
+    (both sides odd, or a side shorter than 2).
+    """
+    if cols < 2 or rows < 2 or (cols % 2 and rows % 2):
+        raise ValueError(f"a {cols}x{rows} board has no Hamiltonian cycle (needs an even side)")
+    if rows % 2:
+        return [(x, y) for y, x in hamiltonian_cycle(rows, cols)]
+    cells = []
+    for y in range(rows):
+        xs = range(1, cols) if y % 2 == 0 else range(cols - 1, 0, -1)
+        cells.extend((x, y) for x in xs)
+    cells.extend((0, y) for y in range(rows - 1, -1, -1))
+    return cells
+
+
+class CyclePilot:
+    """Input source that drives a game round a Hamiltonian cycle.
+
+    ``pilot(engine)`` returns a direction name, played like a key press;
+    ``pilot.direction(engine)`` the vector itself, for ``Engine.run`` /
+    ``step`` / ``turn`` without the key mapping.  The tour runs the way a
+    new game's snake faces, where the board allows it.
+    """
+
+    def __init__(self, cols: int = GRID_COLS, rows: int = GRID_ROWS, shortcuts: bool = True):
+        cycle = hamiltonian_cycle(cols, rows)
+        i = cycle.index((cols // 2, rows // 2))
+        if cycle[i - 1] != (cols // 2 - 1, rows // 2):
+            cycle.reverse()
+        self.cycle = cycle
+        self.index = {cell: i for i, cell in enumerate(cycle)}
+        after = cycle[1:] + cycle[:1]
+        self.steer = {a: (b[0] - a[0], b[1] - a[1]) for a, b in zip(cycle, after)}
+        self.shortcuts = shortcuts
+
+    def __call__(self, g):
+        d = self.direction(g)
+        return NAMES[d] if d else None
+
+    def direction(self, g):
+        """Direction to take from the head, or None when off the board."""
+        snake = g.snake
+        body = snake.body
+        head = body[0]
+        if head not in self.index:
+            return None
+        n = len(self.cycle)
+        tail = self.index.get(body[-1], 0)
+        ahead = (self.index[head] - tail) % n            # tour distance tail → head
+        # legal moves by how far along the tour (from the tail) they land
+        moves = {}
+        hx, hy = head
+        for d in NAMES:
+            cell = (hx + d[0], hy + d[1])
+            i = self.index.get(cell)
+            if i is not None and cell not in body:
+                moves[(i - tail) % n] = d
+        if not moves:
+            return self.steer[head]
+        if self.shortcuts:
+            food = self.index.get(g.food.position)
+            goal = (food - tail) % n if food is not None else n
+            if goal <= ahead:                            # food under the body: no target
+                goal = n
+            # skipped cells only rejoin the free stretch ahead once the
+            # tail passes them, so keep a body length of it in hand
+            limit = min(goal, n - len(body) - snake.pending_growth - 2)
+            best = max((rel for rel in moves if ahead < rel <= limit), default=None)
+            if best is not None:
+                return moves[best]
+        if ahead + 1 in moves:
+            return moves[ahead + 1]                      # next cell of the tour
+        return moves[max(moves)]
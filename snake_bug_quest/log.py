@@ -0,0 +1,161 @@
+"""Snake Bug Quest — buffered, structured event log.
+
+The game loop never writes to a terminal or pipe itself: each call stores
+a ``(time, level, event, fields)`` record in a bounded ring buffer and
+returns.  A background thread drains the buffer every LOG_FLUSH_INTERVAL
+seconds, formats the records (text lines on stdout, or JSON lines with
+``configure(path=...)``) and writes them in one go.  Records below the
+configured level are dropped before anything is stored; guard calls whose
+fields are costly to build with ``enabled(DEBUG)``.
+"""
+
+import atexit, json, sys, threading, time
+from collections import deque
+
+from config import LOG_BUFFER, LOG_FLUSH_INTERVAL, LOG_LEVEL
+
+DEBUG, INFO, WARNING, ERROR = 10, 20, 30, 40
+LEVELS = {"debug": DEBUG, "info": INFO, "warning": WARNING, "error": ERROR}
+NAMES = {v: k for k, v in LEVELS.items()}
+
+# Text-mode layouts by event; other events print as "[event] key=value ...".
+TEXT = {
+    "status": "  dir={dir} head={head} food={food} len={len} "
+              "grow={grow} spd={spd} score={score} stg={stage}",
+    "food_eaten": "[game] ate food  score={score}",
+    "stage_cleared": "[game] ▶ stage {stage}",
+    "all_fixed": "[game] 🎉 ALL BUGS FIXED!",
+    "frame_trace": "[game] frame trace → {path}",
+    "recording_failed": "[game] recording not saved: {error}",
+    "progress_failed": "[progress] write failed: {error}",
+    "trace_failed": "[profiler] trace not written: {error}",
+}
+
+
+def format_text(record) -> str:
+    _, level, event, fields = record
+    layout = TEXT.get(event)
+    if layout:
+        return layout.format(**fields)
+    parts = " ".join(f"{k}={v}" for k, v in fields.items())
+    return f"[{event}] {parts}" if level < WARNING else f"[{event}] {NAMES[level]}: {parts}"
+
+
+def format_json(record) -> str:
+    ts, level, event, fields = record
+    return json.dumps({"ts": round(ts, 6), "level": NAMES[level], "event": event, **fields},
+                      separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+class EventLog:
+    """Ring-buffered records, written by a background thread."""
+
+    def __init__(self, level=LOG_LEVEL, path=None, size: int = LOG_BUFFER,
+                 interval: float = LOG_FLUSH_INTERVAL):
+        self.level = LEVELS.get(level, level)
+        self.path = path
+        self.interval = interval
+        self.dropped = 0                 # records lost to a full buffer
+        self._records = deque(maxlen=size)
+        self._wake = threading.Event()
+        self._lock = threading.Lock()    # one writer at a time
+        self._thread = None
+
+    def enabled(self, level: int) -> bool:
+        return level >= self.level
+
+    def log(self, level: int, event: str, **fields) -> None:
+        if level < self.level:
+            return
+        records = self._records
+        if len(records) == records.maxlen:
+            self.dropped += 1
+        records.append((time.time(), level, event, fields))
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="event-log", daemon=True)
+            self._thread.start()
+        if level >= WARNING:
+            self._wake.set()
+
+    def debug(self, event, **fields):
+        self.log(DEBUG, event, **fields)
+
+    def info(self, event, **fields):
+        self.log(INFO, event, **fields)
+
+    def warning(self, event, **fields):
+        self.log(WARNING, event, **fields)
+
+    def error(self, event, **fields):
+        self.log(ERROR, event, **fields)
+
+    # ── writing ────────────────────────────────────────────────────
+    def flush(self) -> None:
+        """Format and write everything buffered so far (blocks)."""
+        with self._lock:
+            batch = []
+            records = self._records
+            while records:
+                batch.append(records.popleft())
+            dropped, self.dropped = self.dropped, 0
+            if not batch and not dropped:
+                return
+            if self.path:
+                lines = [format_json(r) for r in batch]
+                if dropped:
+                    lines.append(format_json((time.time(), WARNING, "log_overflow",
+                                              {"dropped": dropped})))
+                try:
+                    with open(self.path, "a", encoding="utf-8") as f:
+                        f.write("\n".join(lines) + "\n")
+                except OSError as e:
+                    sys.stderr.write(f"[log] {self.path}: {e}\n")
+            else:
+                lines = [format_text(r) for r in batch]
+                if dropped:
+                    lines.append(f"[log] {dropped} records dropped")
+                sys.stdout.write("\n".join(lines) + "\n")
+                sys.stdout.flush()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
+
+
+_log = EventLog()
+atexit.register(_log.flush)
+
+
+def configure(level=None, path=None) -> None:
+    """Set the level ("debug", "info", ...) and/or send JSON lines to *path*."""
+    _log.flush()
+    if level is not None:
+        _log.level = LEVELS.get(level, level)
+    if path is not None:
+        _log.path = path
+
+
+def enabled(level: int) -> bool:
+    return _log.enabled(level)
+
+
+def debug(event, **fields):
+    _log.log(DEBUG, event, **fields)
+
+
+def info(event, **fields):
+    _log.log(INFO, event, **fields)
+
+
+def warning(event, **fields):
+    _log.log(WARNING, event, **fields)
+
+
+def error(event, **fields):
+    _log.log(ERROR, event, **fields)
+
+
+def flush() -> None:
+    _log.flush()
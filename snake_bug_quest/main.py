@@ -1,16 +1,63 @@
 #!/usr/bin/env python3
 """Snake Bug Quest — entry point.
 
-    python main.py            # launch
-    python main.py --reset    # reset progress & launch
+    python main.py                         # launch
+    python main.py --reset                 # reset progress & launch
+    python main.py --player ID [--kiosk K] # per-player progress (progress.db)
+    python main.py --record DIR            # save every game for replay.py
+    python main.py --profile trace.json    # profiler HUD on, trace saved on exit
+    python main.py --log events.jsonl      # event log as JSON lines
+    python main.py --marathon [500x400]    # large scrolling board (default 2000x2000)
+    python main.py --autopilot             # the game plays itself (A toggles)
 """
 
-import sys
-from progress import reset_progress
+import argparse
+import log
+import progress
+from config import GRID_COLS, GRID_ROWS, MARATHON_SIZE
 from game import Game
 
+
+def board_size(text):
+    """"COLSxROWS" → (cols, rows); no smaller than the default board."""
+    try:
+        cols, rows = (int(n) for n in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected COLSxROWS, got {text!r}")
+    if cols < GRID_COLS or rows < GRID_ROWS:
+        raise argparse.ArgumentTypeError(f"board must be at least {GRID_COLS}x{GRID_ROWS}")
+    return cols, rows
+
+
 if __name__ == "__main__":
-    if "--reset" in sys.argv:
-        reset_progress()
+    ap = argparse.ArgumentParser(description="Snake Bug Quest")
+    ap.add_argument("--reset", action="store_true", help="reset progress & launch")
+    ap.add_argument("--player", help="participant ID for the multi-player store")
+    ap.add_argument("--kiosk", default="", help="kiosk ID (with --player)")
+    ap.add_argument("--db", help="progress database path (with --player)")
+    ap.add_argument("--record", metavar="DIR", help="save each game's inputs to DIR")
+    ap.add_argument("--log", metavar="FILE", help="write the event log to FILE as JSON lines")
+    ap.add_argument("--log-level", choices=("debug", "info", "warning", "error"),
+                    help="least severe events logged (default: debug)")
+    ap.add_argument("--marathon", nargs="?", type=board_size, metavar="COLSxROWS",
+                    const=MARATHON_SIZE, default=(GRID_COLS, GRID_ROWS),
+                    help="play on a large scrolling board (default %dx%d)" % MARATHON_SIZE)
+    ap.add_argument("--autopilot", action="store_true",
+                    help="start with the autopilot playing (A toggles it)")
+    ap.add_argument("--profile", metavar="FILE",
+                    help="show the profiler HUD and write a Chrome trace to FILE on exit")
+    args = ap.parse_args()
+
+    log.configure(level=args.log_level, path=args.log)
+    backend = progress
+    if args.player:
+        from config import PROGRESS_DB
+        from progress_store import ProgressStore, PlayerProgress
+        backend = PlayerProgress(ProgressStore(args.db or PROGRESS_DB),
+                                 args.player, args.kiosk)
+    if args.reset:
+        backend.reset_progress()
         print("[main] progress reset")
-    Game().run()
+    cols, rows = args.marathon
+    Game(progress=backend, record_dir=args.record, profile=args.profile,
+         cols=cols, rows=rows, autopilot=args.autopilot).run()
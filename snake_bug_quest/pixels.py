@@ -0,0 +1,138 @@
+"""Snake Bug Quest — offscreen pixel frames as NumPy arrays.
+
+For pixel-based agents and video capture; no display is needed.  The
+four cell sprites (empty, body, head, food) are drawn once with pygame
+in the same colours, insets and corner radii as ``renderer.Renderer``
+and stacked into an atlas.  A frame is then the atlas indexed by a
+(rows, cols) map of sprite ids and reshaped to (H, W, 3) — one gather,
+no per-cell drawing — and a batch of N boards is the same gather with a
+leading axis:
+
+    px = PixelRenderer()
+    frame = px.render_engine(engine)           # (500, 600, 3) uint8
+    frames = px.render_obs(vec_env.obs)        # (N, 500, 600, 3)
+
+Only the board is drawn (no panel or overlays).  Needs NumPy.
+"""
+
+try:
+    import numpy as np
+except ImportError:
+    raise ImportError("pixels.py needs NumPy: pip install numpy") from None
+
+import pygame
+
+from config import (
+    CELL_SIZE, GRID_COLS, GRID_ROWS,
+    BG_COLOR, GRID_COLOR, SNAKE_COLOR, SNAKE_HEAD_COLOR, FOOD_COLOR,
+)
+
+# Sprite ids, in atlas order.
+EMPTY, BODY, HEAD, FOOD = 0, 1, 2, 3
+
+
+class PixelRenderer:
+    """Board → RGB array renderer for a *cols* × *rows* board.
+
+    *cell* is the sprite size in pixels; insets and corner radii scale
+    with it, so a small *cell* gives compact observations.
+    """
+
+    def __init__(self, cols: int = GRID_COLS, rows: int = GRID_ROWS, cell: int = CELL_SIZE):
+        self.cols, self.rows, self.cell = cols, rows, cell
+        self.atlas = self._build_atlas(cell)        # (4, cell, cell, 3)
+        # each sprite pixel row as one opaque item, sprite s row r at s * cell + r
+        self._rows = self.atlas.reshape(4 * cell, 3 * cell).view(f"V{3 * cell}")[:, 0]
+        self._row = np.arange(cell)[:, None]
+
+    @staticmethod
+    def _build_atlas(cell):
+        def scaled(n):
+            return max(0, round(n * cell / CELL_SIZE))
+
+        sprites = []
+        for sprite in (EMPTY, BODY, HEAD, FOOD):
+            surf = pygame.Surface((cell, cell))
+            surf.fill(BG_COLOR)
+            pygame.draw.line(surf, GRID_COLOR, (0, 0), (cell - 1, 0))
+            pygame.draw.line(surf, GRID_COLOR, (0, 0), (0, cell - 1))
+            if sprite in (BODY, HEAD):
+                inset = scaled(1)
+                pygame.draw.rect(surf, SNAKE_HEAD_COLOR if sprite == HEAD else SNAKE_COLOR,
+                                 (inset, inset, cell - 2 * inset, cell - 2 * inset),
+                                 border_radius=scaled(4))
+            elif sprite == FOOD:
+                inset = scaled(2)
+                pygame.draw.rect(surf, FOOD_COLOR,
+                                 (inset, inset, cell - 2 * inset, cell - 2 * inset),
+                                 border_radius=scaled(6))
+            sprites.append(pygame.surfarray.array3d(surf).transpose(1, 0, 2))
+        return np.ascontiguousarray(np.stack(sprites))
+
+    # ── frames ─────────────────────────────────────────────────────
+    def render(self, ids, out=None):
+        """Frames for sprite-id maps *ids*: (rows, cols) → (H, W, 3) or
+        (N, rows, cols) → (N, H, W, 3).  *out*, if given, receives them;
+        it must be a C-contiguous uint8 array of exactly that shape."""
+        ids = np.asarray(ids, np.intp)
+        lead, (rows, cols) = ids.shape[:-2], ids.shape[-2:]
+        c = self.cell
+        # pixel row r of cell (y, x) is sprite row ids[y, x] * c + r: one take
+        idx = ids[..., :, None, :] * c + self._row
+        if out is not None:
+            shape = lead + (rows * c, cols * c, 3)
+            if out.shape != shape or out.dtype != np.uint8 or not out.flags.c_contiguous:
+                raise ValueError(f"out must be a C-contiguous uint8 array of shape {shape}, "
+                                 f"not {out.dtype} {out.shape}"
+                                 f"{'' if out.flags.c_contiguous else ' (non-contiguous)'}")
+            rows_out = out.reshape(lead + (rows, c, cols, 3 * c)).view(self._rows.dtype)
+            np.take(self._rows, idx, out=rows_out[..., 0])
+            return out
+        frames = np.take(self._rows, idx)
+        return frames.view(np.uint8).reshape(lead + (rows * c, cols * c, 3))
+
+    @staticmethod
+    def ids_from_obs(obs):
+        """Sprite ids from ``env`` observations, (3, rows, cols) or batched.
+
+        Head beats body beats food, as the screen renderer paints them.
+        """
+        obs = np.asarray(obs)
+        snake, head, food = obs[..., 0, :, :], obs[..., 1, :, :], obs[..., 2, :, :]
+        ids = np.where(food != 0, FOOD, EMPTY).astype(np.uint8)
+        ids[snake != 0] = BODY
+        ids[head != 0] = HEAD
+        return ids
+
+    def render_obs(self, obs, out=None):
+        """Frames for ``env`` observations (single or batched)."""
+        return self.render(self.ids_from_obs(obs), out)
+
+    def render_batch(self, b, out=None):
+        """Frames for every game of a ``batch.BatchEngine`` at once."""
+        ids = b.grids.astype(np.uint8)                      # 1 = BODY
+        flat = ids.reshape(b.n, -1)
+        games = np.arange(b.n)
+        hx, hy = b.xy(b.head)
+        flat[games, hy * b.cols + hx] = HEAD
+        has_food = b.food >= 0
+        fx, fy = b.xy(b.food[has_food])
+        cells = fy * b.cols + fx
+        g = games[has_food]
+        flat[g, cells] = np.where(flat[g, cells] == EMPTY, FOOD, flat[g, cells])
+        return self.render(ids, out)
+
+    def render_engine(self, g, out=None):
+        """Frame for one ``Engine`` (cells off the board are skipped)."""
+        ids = np.zeros((self.rows, self.cols), np.uint8)
+        food = g.food.position
+        if food is not None:
+            ids[food[1], food[0]] = FOOD
+        body = g.snake.body
+        for x, y in body:
+            if 0 <= x < self.cols and 0 <= y < self.rows:
+                ids[y, x] = BODY
+        x, y = body[0]
+        if 0 <= x < self.cols and 0 <= y < self.rows and body.count((x, y)) == 1:
+            ids[y, x] = HEAD
+        return self.render(ids, out)
@@ -0,0 +1,121 @@
+"""Snake Bug Quest — per-phase frame profiler.
+
+Each phase of the game loop (input, tick, draw, ...) is timed with
+``perf_counter_ns`` into a fixed-size ring buffer, so profiling costs the
+same tiny amount per frame however long the kiosk runs.  The rings feed
+the F3 HUD (p50/p99 per phase) and can be dumped as Chrome trace-event
+JSON (F4) for chrome://tracing or Perfetto.
+"""
+
+import json, threading
+from array import array
+from collections import deque
+from time import perf_counter_ns
+
+from config import PROFILE_FRAMES
+import log
+
+# input/tick/draw/sleep split the frame; log, save and panel nest inside them.
+# lag runs from reading a turn key off the event queue to the tick applying it.
+PHASES = ("input", "tick", "log", "save", "draw", "panel", "sleep", "lag")
+
+
+class PhaseRing:
+    """Start times and durations (ns) of the last *size* runs of a phase."""
+
+    __slots__ = ("starts", "durations", "count")
+
+    def __init__(self, size: int):
+        self.starts = array("q", bytes(8 * size))
+        self.durations = array("q", bytes(8 * size))
+        self.count = 0
+
+    def add(self, start: int, duration: int) -> None:
+        i = self.count % len(self.durations)
+        self.starts[i] = start
+        self.durations[i] = duration
+        self.count += 1
+
+    def __len__(self):
+        return min(self.count, len(self.durations))
+
+    def runs(self):
+        """(start, duration) pairs, oldest first."""
+        size = len(self.durations)
+        first = self.count - len(self)
+        return [(self.starts[i % size], self.durations[i % size])
+                for i in range(first, self.count)]
+
+
+class FrameProfiler:
+    """Phase timings of the game loop; see ``add`` and ``mark``."""
+
+    def __init__(self, size: int = PROFILE_FRAMES):
+        self.rings = {phase: PhaseRing(size) for phase in PHASES}
+        self.marks = deque(maxlen=size)      # (ns, name, args) instant events
+
+    def add(self, phase: str, start: int) -> int:
+        """Record *phase* as running from *start* (``perf_counter_ns``) until now.
+
+        Returns now, so back-to-back phases can chain their timestamps.
+        """
+        now = perf_counter_ns()
+        self.rings[phase].add(start, now - start)
+        return now
+
+    def span(self, phase: str, start: int, duration: int) -> None:
+        """Record *phase* with a known *start* and *duration* (ns)."""
+        self.rings[phase].add(start, duration)
+
+    def mark(self, name: str, **args) -> None:
+        """Record an instant event, e.g. ticks dropped by the catch-up limit."""
+        self.marks.append((perf_counter_ns(), name, args))
+
+    # ── summaries ──────────────────────────────────────────────────
+    def percentiles(self, phase: str):
+        """(p50, p99) of *phase* in milliseconds, or None with no samples."""
+        ring = self.rings[phase]
+        if not len(ring):
+            return None
+        d = sorted(ring.durations[:len(ring)])
+        return d[len(d) // 2] / 1e6, d[min(len(d) - 1, len(d) * 99 // 100)] / 1e6
+
+    def hud_lines(self, dropped_ticks: int = 0):
+        """Panel lines: one per phase with samples, then the dropped-tick count."""
+        lines = ["phase    p50    p99 ms"]
+        for phase in PHASES:
+            p = self.percentiles(phase)
+            if p:
+                lines.append(f"{phase:<6}{p[0]:>6.2f} {p[1]:>6.2f}")
+        lines.append(f"dropped ticks: {dropped_ticks}")
+        return lines
+
+    # ── export ─────────────────────────────────────────────────────
+    def chrome_trace(self) -> dict:
+        """The buffered phases and marks as a Chrome trace-event document."""
+        runs = [(start, dur, phase) for phase, ring in self.rings.items()
+                for start, dur in ring.runs()]
+        marks = list(self.marks)
+        base = min([r[0] for r in runs] + [m[0] for m in marks], default=0)
+        events = [{"name": phase, "cat": "frame", "ph": "X", "pid": 0, "tid": 0,
+                   "ts": (start - base) / 1000, "dur": dur / 1000}
+                  for start, dur, phase in sorted(runs)]
+        events += [{"name": name, "cat": "frame", "ph": "i", "s": "t", "pid": 0, "tid": 0,
+                    "ts": (ts - base) / 1000, "args": args}
+                   for ts, name, args in marks]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def dump(self, path: str) -> threading.Thread:
+        """Write ``chrome_trace()`` to *path* from a background thread."""
+        trace = self.chrome_trace()
+
+        def write():
+            try:
+                with open(path, "w") as f:
+                    json.dump(trace, f, separators=(",", ":"))
+            except OSError as e:
+                log.error("trace_failed", path=path, error=str(e))
+
+        t = threading.Thread(target=write, name="trace-writer")
+        t.start()
+        return t
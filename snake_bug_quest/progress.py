@@ -1,12 +1,93 @@
-"""Snake Bug Quest — progress persistence."""
+"""Snake Bug Quest — progress persistence.
 
-import json, os
+Saves go through a background writer so the game loop never waits on the
+disk: rapid saves coalesce into one write, and every write lands via a
+temp file + fsync + ``os.replace`` so a crash can't leave a torn file.
+"""
+
+import atexit, json, os, threading
 from datetime import datetime
 from config import PROGRESS_FILE, TOTAL_STAGES
+import log
+
+
+class ProgressWriter:
+    """Write-behind writer; only the latest pending payload is written.
+
+    By default payloads are JSON-written to *path*; pass *write* to send
+    them elsewhere (e.g. a ``progress_store.ProgressStore``).  Only
+    ``OSError`` is caught and logged here: a custom *write* handles its
+    own backend's errors.
+    """
+
+    def __init__(self, path: str = PROGRESS_FILE, write=None):
+        self.path = path
+        self._write = write or (lambda data: write_atomic(self.path, data))
+        self._pending = None
+        self._busy = False
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def submit(self, data: dict) -> None:
+        """Queue *data* for writing, replacing any not yet written."""
+        with self._cond:
+            self._pending = data
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="progress-writer", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def flush(self) -> None:
+        """Block until everything submitted so far is on disk."""
+        with self._cond:
+            while self._pending is not None or self._busy:
+                self._cond.wait()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None:
+                    self._cond.wait()
+                data, self._pending = self._pending, None
+                self._busy = True
+            try:
+                self._write(data)
+            except OSError as e:
+                log.error("progress_failed", path=self.path, error=str(e))
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+
+def write_atomic(path: str, data: dict) -> None:
+    """Write JSON to *path* so readers see either the old or the new file."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+_writer = ProgressWriter()
+atexit.register(_writer.flush)
 
 
 def load_progress() -> int:
     """Return current stage (1..TOTAL_STAGES). Creates file if absent."""
+    _writer.flush()
     if not os.path.exists(PROGRESS_FILE):
         save_progress(1)
         return 1
@@ -21,9 +102,14 @@ def load_progress() -> int:
 
 
 def save_progress(stage: int) -> None:
-    with open(PROGRESS_FILE, "w") as f:
-        json.dump({"stage": stage, "updated_at": datetime.now().isoformat()}, f, indent=2)
+    """Queue a save; returns immediately."""
+    _writer.submit({"stage": stage, "updated_at": datetime.now().isoformat()})
 
 
 def reset_progress() -> None:
     save_progress(1)
+
+
+def flush_progress() -> None:
+    """Wait for queued saves to reach the disk (called on shutdown)."""
+    _writer.flush()
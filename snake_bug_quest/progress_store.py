@@ -0,0 +1,164 @@
+"""Snake Bug Quest — multi-player progress store for booth fleets.
+
+One SQLite database holds every participant's stage per kiosk plus the
+time each stage was reached.  Lookups go through the primary key or the
+stage index (O(log n)); ``save_many`` batches writes into one transaction.
+The single-player ``progress.json`` functions remain the default.
+"""
+
+import atexit, sqlite3, threading
+from datetime import datetime
+
+from config import PROGRESS_DB, TOTAL_STAGES
+from progress import ProgressWriter
+import log
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS progress (
+    player_id  TEXT NOT NULL,
+    kiosk_id   TEXT NOT NULL,
+    stage      INTEGER NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (player_id, kiosk_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS progress_by_stage ON progress (stage, updated_at);
+CREATE TABLE IF NOT EXISTS stage_times (
+    player_id  TEXT NOT NULL,
+    kiosk_id   TEXT NOT NULL,
+    stage      INTEGER NOT NULL,
+    reached_at TEXT NOT NULL,
+    PRIMARY KEY (player_id, kiosk_id, stage)
+) WITHOUT ROWID;
+"""
+
+
+def _clamp(stage: int) -> int:
+    return max(1, min(int(stage), TOTAL_STAGES + 1))
+
+
+class ProgressStore:
+    """Stage per (player, kiosk), backed by SQLite in WAL mode."""
+
+    def __init__(self, path: str = PROGRESS_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(SCHEMA)
+
+    # ── reads ──────────────────────────────────────────────────────
+    def load(self, player: str, kiosk: str | None = None) -> int:
+        """Stage for *player* on *kiosk*, or their best stage on any kiosk."""
+        with self._lock:
+            if kiosk is None:
+                row = self._db.execute(
+                    "SELECT MAX(stage) FROM progress WHERE player_id = ?",
+                    (player,)).fetchone()
+            else:
+                row = self._db.execute(
+                    "SELECT stage FROM progress WHERE player_id = ? AND kiosk_id = ?",
+                    (player, kiosk)).fetchone()
+        return _clamp(row[0]) if row and row[0] is not None else 1
+
+    def players_on_stage(self, stage: int) -> list:
+        """(player, kiosk) pairs currently on *stage*, oldest update first."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT player_id, kiosk_id FROM progress WHERE stage = ? "
+                "ORDER BY updated_at", (stage,)).fetchall()
+
+    def stage_counts(self) -> dict:
+        """Number of (player, kiosk) entries per stage."""
+        with self._lock:
+            return dict(self._db.execute(
+                "SELECT stage, COUNT(*) FROM progress GROUP BY stage"))
+
+    def stage_times(self, player: str, kiosk: str = "") -> dict:
+        """stage → ISO timestamp of when *player* first reached it."""
+        with self._lock:
+            return dict(self._db.execute(
+                "SELECT stage, reached_at FROM stage_times "
+                "WHERE player_id = ? AND kiosk_id = ? ORDER BY stage",
+                (player, kiosk)))
+
+    # ── writes ─────────────────────────────────────────────────────
+    def save(self, player: str, stage: int, kiosk: str = "") -> None:
+        self.save_many([(player, kiosk, stage)])
+
+    def save_many(self, rows) -> None:
+        """Write (player, kiosk, stage) rows in a single transaction.
+
+        A row may carry a fourth item, the ISO time the stage was reached
+        (default now); rows for the same player and kiosk are applied in
+        order, so the last one sets ``progress``.
+        """
+        now = datetime.now().isoformat()
+        rows = [(r[0], r[1], _clamp(r[2]), r[3] if len(r) > 3 else now) for r in rows]
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT INTO progress (player_id, kiosk_id, stage, updated_at) "
+                "VALUES (?, ?, ?, ?) ON CONFLICT (player_id, kiosk_id) "
+                "DO UPDATE SET stage = excluded.stage, updated_at = excluded.updated_at",
+                rows)
+            self._db.executemany(
+                "INSERT OR IGNORE INTO stage_times "
+                "(player_id, kiosk_id, stage, reached_at) VALUES (?, ?, ?, ?)",
+                rows)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class PlayerProgress:
+    """One player's progress in a ProgressStore.
+
+    Mirrors the ``progress`` module functions, so a ``Game`` can use either;
+    saves are written behind the game loop like ``progress.json`` ones.
+    Unlike those they are not coalesced: every stage saved is queued with
+    the time it was reached, and each write sends the whole queue to
+    ``save_many``, so ``stage_times`` misses none of them.
+    """
+
+    def __init__(self, store: ProgressStore, player: str, kiosk: str = ""):
+        self.store = store
+        self.player = player
+        self.kiosk = kiosk
+        self._queue = []          # (player, kiosk, stage, reached_at) not yet written
+        self._lock = threading.Lock()
+        self._writer = ProgressWriter(write=self._write)
+        atexit.register(self._writer.flush)
+
+    def _write(self, _):
+        """ProgressWriter callback: send the queue to the store."""
+        with self._lock:
+            rows, self._queue = self._queue, []
+        if not rows:
+            return
+        try:
+            self.store.save_many(rows)
+        except sqlite3.Error as e:
+            with self._lock:
+                self._queue[:0] = rows        # retried with the next save
+            log.error("progress_failed", path=self.store.path, error=str(e))
+
+    def load_progress(self) -> int:
+        """Stored stage; a first visit is saved as stage 1 so it gets a time too."""
+        self._writer.flush()
+        stage = self.store.load(self.player, self.kiosk)
+        if stage == 1 and 1 not in self.store.stage_times(self.player, self.kiosk):
+            self.save_progress(1)
+        return stage
+
+    def save_progress(self, stage: int) -> None:
+        with self._lock:
+            self._queue.append((self.player, self.kiosk, stage, datetime.now().isoformat()))
+        self._writer.submit(True)
+
+    def reset_progress(self) -> None:
+        self.save_progress(1)
+
+    def flush_progress(self) -> None:
+        self._writer.flush()
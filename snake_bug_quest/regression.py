@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""Snake Bug Quest — replay regression harness for the stage detectors.
+
+Replays every recording in a trace corpus headlessly against one or more
+variants of the game and reports which stages each trace clears, at which
+tick, and how long the replay took.  A variant is a package directory
+(like this one) or a single-file edition (``snake.py``).  Replays are
+spread over a process pool, one task per variant and chunk of traces.
+
+    python regression.py                          # this tree + ../snake.py
+    python regression.py --variant buggy=. --variant fixed=/path/to/solution \\
+                         --variant buggy-single=../snake.py
+    python regression.py --stage 1=. --stage 2=/trees/s2 ... --stage 7=/trees/s7
+
+A trace targets the stage it was recorded from.  Variants named
+``buggy…`` are expected never to clear that stage and variants named
+``fixed…`` always to clear it; any other name is just reported.
+
+On the fully buggy tree the early bugs keep most games from ever
+reaching the later stages, so "never clears" proves little there.
+``--stage N=PATH`` gives the tree a participant on stage N has — bugs
+1..N-1 fixed, bug N still in — and each stage-N trace is replayed on
+its own stage's tree as well, in the ``staged`` column, expected not to
+clear.  Broken expectations are listed and make the exit status 1,
+except the known detector weaknesses in ``KNOWN``, which are listed but
+tolerated.
+"""
+
+import argparse, fnmatch, glob, importlib, importlib.util, os, sys, time
+from concurrent.futures import ProcessPoolExecutor
+
+from replay import Recording, play
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+TRACE_DIR = os.path.join(HERE, "traces")
+CHUNK = 8       # traces per pool task
+
+STAGED = "buggy-staged"      # label of the per-stage tree results
+
+# Traces a ``buggy…`` variant may clear, and why: detector false positives
+# that are known and kept in the corpus so they stay visible.  Stages 5-7
+# are only caught by play that provokes the bug, which these traces (a
+# careful bot's) do not; they show up once the stage trees are given.
+KNOWN = {
+    # the goal is met within a couple of hundred ticks, before the bug shows
+    "stage5-*.sbqr": "stage 5 detector: cleared before the bug can show",
+    # no trace moves down off the last row, so the buggy bottom wall is
+    # never tested
+    "stage6-*.sbqr": "stage 6 detector: bottom wall never tested",
+    # no trace runs into its own body
+    "stage7-*.sbqr": "stage 7 detector: no self-collision played",
+}
+
+
+# ── loading variants (inside the worker processes) ─────────────────
+_variant = {"path": None, "make": None, "modules": ()}
+
+
+def _load_package(path):
+    """Import the package at *path* and return its Engine class.
+
+    The package uses flat imports (``from config import ...``), so every
+    module it shares a name with is dropped from ``sys.modules`` first.
+    """
+    names = [f[:-3] for f in os.listdir(path) if f.endswith(".py")]
+    for name in names:
+        sys.modules.pop(name, None)
+    sys.path.insert(0, path)
+    try:
+        engine = importlib.import_module("engine")
+    finally:
+        sys.path.remove(path)
+    return engine.Engine, names
+
+
+def _load_single_file(path):
+    """Import a single-file edition and wrap its Game for headless replay."""
+    spec = importlib.util.spec_from_file_location("sbq_single_file", path)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    mod.save_progress = lambda stage: None          # keep progress.json untouched
+    mod.print = lambda *args, **kwargs: None        # and the status lines quiet
+    name_to_key = {name: key for key, name in mod.KEY_TO_NAME.items()}
+
+    class Headless(mod.Game):
+        """The single-file Game without a window, driven like an Engine."""
+
+        def __init__(self, stage, seed):
+            mod.RANDOM_SEED = seed
+            self.stage = stage
+            self._new_game()
+
+        @property
+        def running(self):
+            return self.alive and not self.all_fixed
+
+        def steer(self, name):
+            self._on_key(name_to_key[name])
+
+    return Headless, ()
+
+
+def load_variant(path):
+    """``make(stage, seed)`` for the variant at *path*: a package directory
+    or a single-file edition.  Loading another variant unloads this one."""
+    if _variant["path"] != path:
+        for name in _variant["modules"]:
+            sys.modules.pop(name, None)
+        load = _load_single_file if path.endswith(".py") else _load_package
+        _variant["make"], _variant["modules"] = load(path)
+        _variant["path"] = path
+    return _variant["make"]
+
+
+def _run_chunk(task):
+    """Replay *traces* on the variant at *path*; one result dict per trace."""
+    label, path, traces = task
+    make = load_variant(path)
+    results = []
+    for trace in traces:
+        rec = Recording.load(trace)
+        stage, clears = rec.stage, []
+
+        def watch(g):
+            nonlocal stage
+            if g.stage != stage:
+                clears.append((stage, g.frame))
+                stage = g.stage
+
+        t0 = time.perf_counter()
+        g = play(rec, watch, engine=make(rec.stage, rec.seed))
+        results.append({
+            "variant": label, "trace": os.path.basename(trace),
+            "stage": rec.stage, "clears": clears, "ticks": g.frame,
+            "end": ("all fixed" if g.all_fixed else "board full" if g.board_full
+                    else "game over" if not g.alive else "end of trace"),
+            "seconds": time.perf_counter() - t0,
+        })
+    return results
+
+
+# ── reporting ──────────────────────────────────────────────────────
+def _expectation(label):
+    if label.startswith("buggy"):
+        return False
+    if label.startswith("fixed"):
+        return True
+    return None
+
+
+def _known(trace):
+    """Why *trace* may clear its stage on a buggy variant, or None."""
+    return next((why for pattern, why in KNOWN.items()
+                 if fnmatch.fnmatch(trace, pattern)), None)
+
+
+def run(variants, traces, jobs=None, stages=None):
+    """Replay *traces* against *variants* ({label: path}), and the traces
+    of each stage in *stages* ({stage: path}) against that stage's tree
+    under the ``STAGED`` label; returns result dicts."""
+    tasks = [(label, path, traces[i:i + CHUNK])
+             for label, path in variants.items()
+             for i in range(0, len(traces), CHUNK)]
+    for stage, path in (stages or {}).items():
+        own = [t for t in traces if Recording.load(t).stage == stage]
+        tasks += [(STAGED, path, own[i:i + CHUNK]) for i in range(0, len(own), CHUNK)]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return [r for chunk in pool.map(_run_chunk, tasks) for r in chunk]
+
+
+def report(variants, results) -> int:
+    """Print the trace × variant table; returns the number of broken expectations."""
+    by_key = {(r["trace"], r["variant"]): r for r in results}
+    traces = sorted({(r["stage"], r["trace"]) for r in results})
+    labels = list(variants) + ([STAGED] if any(r["variant"] == STAGED for r in results) else [])
+    width = max([len(t) for _, t in traces] + [5])
+    print(f"{'trace':<{width}}  stg  " + "  ".join(f"{l:<17}" for l in labels))
+    failures, known = [], []
+    for stage, trace in traces:
+        cells = []
+        for label in labels:
+            r = by_key.get((trace, label))
+            if r is None:                       # no tree given for this stage
+                cells.append("n/a")
+                continue
+            cleared = [f for s, f in r["clears"] if s == stage]
+            cells.append(f"cleared @{cleared[0]}" if cleared else f"- ({r['end']})")
+            expected = _expectation(label)
+            if expected is not None and bool(cleared) != expected:
+                line = f"{label}: {trace} {'cleared' if cleared else 'did not clear'} stage {stage}"
+                reason = _known(trace) if cleared else None
+                if reason:
+                    known.append(f"{line} ({reason})")
+                else:
+                    failures.append(line)
+        print(f"{trace:<{width}}  {stage:>3}  " + "  ".join(f"{c:<17}" for c in cells))
+    print()
+    for label in labels:
+        rs = [r for r in results if r["variant"] == label]
+        ticks = sum(r["ticks"] for r in rs)
+        secs = sum(r["seconds"] for r in rs)
+        print(f"{label}: {sum(bool(r['clears']) for r in rs)}/{len(rs)} traces "
+              f"cleared a stage, {ticks} ticks in {secs * 1000:.0f} ms")
+    for line in known:
+        print(f"KNOWN       {line}")
+    for line in failures:
+        print(f"UNEXPECTED  {line}")
+    return len(failures)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Replay the trace corpus against game variants")
+    ap.add_argument("--variant", action="append", metavar="NAME=PATH",
+                    help="package directory or single-file snake.py (repeatable)")
+    ap.add_argument("--stage", action="append", metavar="N=PATH",
+                    help="tree on stage N (bugs 1..N-1 fixed) for stage-N traces (repeatable)")
+    ap.add_argument("--traces", default=TRACE_DIR, help="directory of .sbqr recordings")
+    ap.add_argument("-j", "--jobs", type=int, help="worker processes (default: all cores)")
+    args = ap.parse_args()
+
+    variants = dict(v.split("=", 1) for v in args.variant or ())
+    stages = {int(n): os.path.abspath(path)
+              for n, path in (v.split("=", 1) for v in args.stage or ())}
+    if not variants and not stages:
+        variants = {"package": HERE,
+                    "single-file": os.path.join(os.path.dirname(HERE), "snake.py")}
+    variants = {label: os.path.abspath(path) for label, path in variants.items()}
+    traces = sorted(glob.glob(os.path.join(args.traces, "*.sbqr")))
+    if not traces:
+        sys.exit(f"no recordings in {args.traces}")
+
+    t0 = time.perf_counter()
+    results = run(variants, traces, args.jobs, stages)
+    failed = report(variants, results)
+    print(f"{len(results)} replays in {time.perf_counter() - t0:.2f} s")
+    sys.exit(1 if failed else 0)
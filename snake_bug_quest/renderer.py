@@ -0,0 +1,421 @@
+"""Snake Bug Quest — dirty-rectangle renderer."""
+
+from collections import OrderedDict, deque
+from itertools import islice
+from time import perf_counter_ns
+
+import pygame
+
+from config import (
+    CELL_SIZE, GRID_COLS, GRID_ROWS, CAMERA_MARGIN,
+    GAME_AREA_WIDTH, WINDOW_WIDTH, WINDOW_HEIGHT, PANEL_WIDTH,
+    BG_COLOR, GRID_COLOR, SNAKE_COLOR, SNAKE_HEAD_COLOR,
+    FOOD_COLOR, PANEL_BG, TEXT_COLOR, HIGHLIGHT,
+    STAGE_CLR, GAMEOVER_CLR, WIN_CLR,
+    TOTAL_STAGES, STAGE_HINTS,
+)
+
+# Most ticks the renderer can catch up on before falling back to a full redraw.
+MAX_STEPS_PER_FRAME = 8
+
+# The board view is always GRID_COLS × GRID_ROWS cells; bigger boards scroll.
+VIEW_CELLS = GRID_COLS * GRID_ROWS
+
+# Live rows of the side panel, in display order.
+PANEL_FIELDS = (
+    "Score:   {}", "Dir:     {}", "Head:    {}", "Food:    {}",
+    "Length:  {}", "Growth:  {}", "Speed:   {} tps",
+)
+PANEL_GAP = 22
+LABEL_CACHE_SIZE = 256
+
+# Overlay banners: (title, colour, subtitle).
+OVERLAY_BOARD_FULL = ("BOARD FULL", WIN_CLR, "SPACE to play again")
+OVERLAY_GAME_OVER = ("GAME OVER", GAMEOVER_CLR, "SPACE to retry")
+OVERLAY_ALL_FIXED = ("ALL BUGS FIXED ✅", WIN_CLR, "R = reset  |  ESC = exit")
+
+
+class LabelCache:
+    """LRU cache of rendered text surfaces keyed by (text, colour)."""
+
+    def __init__(self, font, size: int = LABEL_CACHE_SIZE):
+        self.font = font
+        self.size = size
+        self._surfaces = OrderedDict()
+
+    def get(self, text, color):
+        key = (text, color)
+        surf = self._surfaces.get(key)
+        if surf is None:
+            surf = self._surfaces[key] = self.font.render(text, True, color)
+            if len(self._surfaces) > self.size:
+                self._surfaces.popitem(last=False)
+        else:
+            self._surfaces.move_to_end(key)
+        return surf
+
+
+class Renderer:
+    """Draws a Game onto the display, repainting only what changed.
+
+    The grid and panel chrome are pre-rendered once into ``background``.
+    Each frame only the cells that changed (new head, old head, vacated
+    tail, old and new food) and the panel rows whose values changed are
+    repainted, then pushed with ``pygame.display.update(rects)``.
+
+    Boards larger than the view (marathon mode) are shown through a camera
+    that jumps to re-centre the head when it comes within CAMERA_MARGIN
+    cells of the view edge; only cells inside the view are ever drawn.
+    """
+
+    def __init__(self, screen, font, big_font):
+        self.screen = screen
+        self.font = font
+        self.big_font = big_font
+        self.background = self._build_background()
+        self._board_rect = pygame.Rect(0, 0, GAME_AREA_WIDTH, WINDOW_HEIGHT)
+        self._cam = (0, 0)        # board cell at the view's top-left corner
+        self._snake = None        # Snake object painted last frame
+        self._body = deque()      # body cells as painted last frame
+        self._food = None
+        self._moving = []         # cells under the sliding head/tail
+        self.labels = LabelCache(font)
+        self._layers = {}         # (stage, all_fixed) -> (pre-composed panel, controls y)
+        self._layer = None
+        self._values = ()         # live panel values painted last frame
+        self._values_y = 0
+        self.hud = None           # profiler HUD lines, shown in place of Controls
+        self._hud_shown = None
+        self._hud_y = 0
+        self.profiler = None      # profiler.FrameProfiler timing the panel
+        self._overlays = None
+        self._shade = pygame.Surface((GAME_AREA_WIDTH, WINDOW_HEIGHT), pygame.SRCALPHA)
+        self._shade.fill((0, 0, 0, 150))
+        self._banners = {
+            ov: self._build_banner(*ov)
+            for ov in (OVERLAY_BOARD_FULL, OVERLAY_GAME_OVER, OVERLAY_ALL_FIXED)
+        }
+
+    def invalidate(self):
+        """Force a full redraw on the next frame."""
+        self._snake = None
+
+    # ── frame ──────────────────────────────────────────────────────
+    def draw(self, g, alpha=None):
+        """Draw one frame.
+
+        With *alpha* (0..1, the fraction of the current tick elapsed) the
+        head and tail are drawn sliding between their previous and current
+        cells instead of snapping.
+        """
+        overlays = self._overlays_for(g)
+        pieces = self._moving_pieces(g, alpha)
+        cam = self._follow(g)
+        dirty = None
+        if g.snake is self._snake and overlays == self._overlays:
+            dirty = self._sync_body(g.snake.body)
+        if dirty is None or cam != self._cam:
+            self._cam = cam
+            self._full_redraw(g, overlays, pieces, alpha, synced=dirty is not None)
+            return
+
+        if g.food.position != self._food:
+            dirty.append(self._food)
+            dirty.append(g.food.position)
+            self._food = g.food.position
+        moving = [cell for start, end, _ in pieces for cell in (start, end)]
+        dirty.extend(self._moving)
+        dirty.extend(moving)
+        self._moving = moving
+        rects = []
+        for cell in set(dirty):
+            if cell is not None:
+                rect = self._paint_cell(g, cell, hide_head=bool(pieces))
+                if rect:
+                    rects.append(rect)
+        self.screen.set_clip(self._board_rect)
+        self._draw_pieces(pieces, alpha)
+        self.screen.set_clip(None)
+        t = perf_counter_ns()
+        rects.extend(self._update_panel(g))
+        if self.profiler:
+            self.profiler.add("panel", t)
+        if rects:
+            pygame.display.update(rects)
+
+    def _full_redraw(self, g, overlays, pieces=(), alpha=None, synced=False):
+        """Repaint everything; *synced* means ``_body`` is already current."""
+        self.screen.blit(self.background, (0, 0))
+        self.screen.set_clip(self._board_rect)
+        self._draw_food(g.food.position)
+        self._draw_snake(g.snake.body, skip_head=bool(pieces))
+        self._draw_pieces(pieces, alpha)
+        self.screen.set_clip(None)
+        self._update_panel(g, full=True)
+        for overlay in overlays:
+            self._overlay(overlay)
+        pygame.display.flip()
+        self._snake = g.snake
+        if not synced:
+            self._body = deque(g.snake.body)
+        self._food = g.food.position
+        self._overlays = overlays
+        self._moving = [cell for start, end, _ in pieces for cell in (start, end)]
+
+    @staticmethod
+    def _moving_pieces(g, alpha):
+        """(from_cell, to_cell, colour) for the head and tail mid-step."""
+        body = g.snake.body
+        if alpha is None or not g.running or len(body) < 2:
+            return ()
+        pieces = [(body[1], body[0], SNAKE_HEAD_COLOR)]
+        if g.snake.vacated is not None:
+            pieces.append((g.snake.vacated, body[-1], SNAKE_COLOR))
+        return pieces
+
+    def _draw_pieces(self, pieces, alpha):
+        cx, cy = self._cam
+        for (x0, y0), (x1, y1), color in pieces:
+            px = (x0 - cx + (x1 - x0) * alpha) * CELL_SIZE
+            py = (y0 - cy + (y1 - y0) * alpha) * CELL_SIZE
+            self._draw_segment_at(round(px), round(py), color)
+
+    @staticmethod
+    def _overlays_for(g):
+        overlays = []
+        if g.board_full:
+            overlays.append(OVERLAY_BOARD_FULL)
+        elif not g.alive:
+            overlays.append(OVERLAY_GAME_OVER)
+        if g.all_fixed:
+            overlays.append(OVERLAY_ALL_FIXED)
+        return tuple(overlays)
+
+    # ── board ──────────────────────────────────────────────────────
+    def _follow(self, g):
+        """Camera position for this frame: unchanged while the head stays
+        CAMERA_MARGIN cells inside the view, else re-centred on the head."""
+        cx, cy = self._cam
+        hx, hy = g.snake.head
+        if not cx + CAMERA_MARGIN <= hx < cx + GRID_COLS - CAMERA_MARGIN:
+            cx = min(max(hx - GRID_COLS // 2, 0), max(g.cols - GRID_COLS, 0))
+        if not cy + CAMERA_MARGIN <= hy < cy + GRID_ROWS - CAMERA_MARGIN:
+            cy = min(max(hy - GRID_ROWS // 2, 0), max(g.rows - GRID_ROWS, 0))
+        return cx, cy
+
+    def _sync_body(self, body):
+        """Bring the painted body copy up to date; return cells to repaint.
+
+        Returns None when the snake moved too far to follow incrementally.
+        """
+        own = self._body
+        if not own or not len(body):
+            return None
+        old_head = own[0]
+        limit = min(len(body), MAX_STEPS_PER_FRAME + 1)
+        steps = 0
+        while steps < limit and body[steps] != old_head:
+            steps += 1
+        if steps == limit:
+            return None
+        if steps == 0 and len(own) == len(body):
+            return []
+        heads = list(islice(body, steps))
+        dirty = [old_head] + heads
+        own.extendleft(reversed(heads))
+        while len(own) > len(body):
+            dirty.append(own.pop())
+        return dirty
+
+    def _paint_cell(self, g, cell, hide_head=False):
+        """Repaint one grid cell from the background; returns its clipped rect."""
+        px, py = (cell[0] - self._cam[0]) * CELL_SIZE, (cell[1] - self._cam[1]) * CELL_SIZE
+        rect = pygame.Rect(px, py, CELL_SIZE, CELL_SIZE).clip(self._board_rect)
+        if not rect:
+            return None
+        self.screen.blit(self.background, rect, rect)
+        if cell == g.food.position:
+            self._draw_food(cell)
+        body = g.snake.body
+        n = body.count(cell)
+        if n:
+            # the head only shows when no later segment is drawn over it
+            if n == 1 and cell == body[0]:
+                if not hide_head:
+                    self._draw_segment_at(px, py, SNAKE_HEAD_COLOR)
+            else:
+                self._draw_segment_at(px, py, SNAKE_COLOR)
+        return rect
+
+    def _draw_snake(self, body, skip_head=False):
+        cx, cy = self._cam
+        if len(body) > VIEW_CELLS:
+            # longer than the view has cells: look the view up in the body
+            head = body[0]
+            for y in range(cy, cy + GRID_ROWS):
+                for x in range(cx, cx + GRID_COLS):
+                    n = body.count((x, y))
+                    if not n:
+                        continue
+                    if n == 1 and (x, y) == head:
+                        if skip_head:
+                            continue
+                        color = SNAKE_HEAD_COLOR
+                    else:
+                        color = SNAKE_COLOR
+                    self._draw_segment_at((x - cx) * CELL_SIZE, (y - cy) * CELL_SIZE, color)
+            return
+        for i, (x, y) in enumerate(body):
+            if i or not skip_head:
+                self._draw_segment_at((x - cx) * CELL_SIZE, (y - cy) * CELL_SIZE,
+                                      SNAKE_HEAD_COLOR if i == 0 else SNAKE_COLOR)
+
+    def _draw_segment_at(self, px, py, color):
+        rect = pygame.Rect(px + 1, py + 1, CELL_SIZE - 2, CELL_SIZE - 2)
+        pygame.draw.rect(self.screen, color, rect, border_radius=4)
+
+    def _draw_food(self, cell):
+        if cell is None:
+            return
+        px, py = (cell[0] - self._cam[0]) * CELL_SIZE, (cell[1] - self._cam[1]) * CELL_SIZE
+        rect = pygame.Rect(px + 2, py + 2, CELL_SIZE - 4, CELL_SIZE - 4)
+        pygame.draw.rect(self.screen, FOOD_COLOR, rect, border_radius=6)
+
+    # ── panel ──────────────────────────────────────────────────────
+    def _update_panel(self, g, full=False):
+        """Repaint the panel rows whose values changed; returns their rects.
+
+        Static rows come from a pre-composed layer (one per stage); only
+        the live value rows are blitted, from the label cache.
+        """
+        key = (g.stage, g.all_fixed)
+        entry = self._layers.get(key)
+        if entry is None:
+            entry = self._layers[key] = self._build_panel_layer(g)
+        layer, self._hud_y = entry
+        rects = []
+        if full or layer is not self._layer:
+            self.screen.blit(layer, (GAME_AREA_WIDTH, 0))
+            rects.append(pygame.Rect(GAME_AREA_WIDTH, 0, PANEL_WIDTH, WINDOW_HEIGHT))
+            self._layer = layer
+            self._values = ()
+            self._hud_shown = None
+        if self.hud != self._hud_shown:
+            rects.append(self._paint_hud(layer))
+
+        snake = g.snake
+        values = (g.score, snake.direction, snake.head, g.food.position,
+                  snake.length, snake.pending_growth, g.tick_rate)
+        old = self._values
+        if values == old:
+            return rects
+        y = self._values_y
+        for i, value in enumerate(values):
+            if not old or old[i] != value:
+                rect = pygame.Rect(GAME_AREA_WIDTH + 2, y, PANEL_WIDTH - 2, PANEL_GAP)
+                self.screen.blit(layer, rect, rect.move(-GAME_AREA_WIDTH, 0))
+                label = self.labels.get(PANEL_FIELDS[i].format(value), TEXT_COLOR)
+                self.screen.blit(label, (GAME_AREA_WIDTH + 14, y))
+                rects.append(rect)
+            y += PANEL_GAP
+        self._values = values
+        return rects
+
+    def _paint_hud(self, layer):
+        """Paint the HUD lines over the Controls block (or restore it)."""
+        rect = pygame.Rect(GAME_AREA_WIDTH + 2, self._hud_y,
+                           PANEL_WIDTH - 2, WINDOW_HEIGHT - self._hud_y)
+        self.screen.blit(layer, rect, rect.move(-GAME_AREA_WIDTH, 0))
+        if self.hud:
+            self.screen.fill(PANEL_BG, rect)
+            y = self._hud_y
+            for i, line in enumerate(self.hud):
+                self.screen.blit(self.labels.get(line, HIGHLIGHT if i == 0 else TEXT_COLOR),
+                                 (GAME_AREA_WIDTH + 14, y))
+                y += PANEL_GAP
+        self._hud_shown = self.hud
+        return rect
+
+    def _build_panel_layer(self, g):
+        """Panel background plus every label that only changes with the stage.
+
+        Returns the layer and the y of its Controls block.
+        """
+        layer = pygame.Surface((PANEL_WIDTH, WINDOW_HEIGHT))
+        layer.blit(self.background, (0, 0),
+                   (GAME_AREA_WIDTH, 0, PANEL_WIDTH, WINDOW_HEIGHT))
+        y = 14
+
+        def lbl(txt, c=TEXT_COLOR):
+            nonlocal y
+            layer.blit(self.labels.get(txt, c), (14, y))
+            y += PANEL_GAP
+
+        lbl("=== BUG QUEST ===", HIGHLIGHT)
+        y += 4
+        stg = f"Stage: {g.stage}/{TOTAL_STAGES}" if not g.all_fixed else "ALL FIXED ✅"
+        lbl(stg, STAGE_CLR)
+        y += 4
+        self._values_y = y
+        y += PANEL_GAP * len(PANEL_FIELDS)
+        y += 10
+        hint = STAGE_HINTS.get(g.stage, "")
+        for part in self._wrap(hint, 26):
+            lbl(part, STAGE_CLR)
+        y += 16
+        controls_y = y
+        lbl("Controls:", HIGHLIGHT)
+        for t in (" Arrows = move", " R = reset progress",
+                   " ESC = quit", " Space = restart",
+                   " [ ] = step back/fwd"):
+            lbl(t)
+        return layer, controls_y
+
+    # ── overlays ───────────────────────────────────────────────────
+    def _overlay(self, overlay):
+        """Shade the board and blit a pre-rendered banner; no allocations."""
+        banner = self._banners.get(overlay)
+        if banner is None:
+            banner = self._banners[overlay] = self._build_banner(*overlay)
+        self.screen.blit(self._shade, (0, 0))
+        for surf, rect in banner:
+            self.screen.blit(surf, rect)
+
+    def _build_banner(self, title, color, subtitle):
+        t = self.big_font.render(title, True, color)
+        t2 = self.font.render(subtitle, True, TEXT_COLOR)
+        return (
+            (t, t.get_rect(center=(GAME_AREA_WIDTH // 2, WINDOW_HEIGHT // 2 - 20))),
+            (t2, t2.get_rect(center=(GAME_AREA_WIDTH // 2, WINDOW_HEIGHT // 2 + 20))),
+        )
+
+    # ── static layers ──────────────────────────────────────────────
+    @staticmethod
+    def _build_background():
+        """Grid, panel background and divider, rendered once."""
+        bg = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+        bg.fill(BG_COLOR)
+        for x in range(0, GAME_AREA_WIDTH + 1, CELL_SIZE):
+            pygame.draw.line(bg, GRID_COLOR, (x, 0), (x, WINDOW_HEIGHT))
+        for y in range(0, WINDOW_HEIGHT + 1, CELL_SIZE):
+            pygame.draw.line(bg, GRID_COLOR, (0, y), (GAME_AREA_WIDTH, y))
+        px = GAME_AREA_WIDTH
+        pygame.draw.rect(bg, PANEL_BG, (px, 0, PANEL_WIDTH, WINDOW_HEIGHT))
+        pygame.draw.line(bg, GRID_COLOR, (px, 0), (px, WINDOW_HEIGHT), 2)
+        return bg
+
+    @staticmethod
+    def _wrap(text, width):
+        if not text:
+            return []
+        words, lines, cur = text.split(), [], ""
+        for w in words:
+            test = f"{cur} {w}" if cur else w
+            if len(test) > width:
+                lines.append(cur)
+                cur = w
+            else:
+                cur = test
+        if cur:
+            lines.append(cur)
+        return lines
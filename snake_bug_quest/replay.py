@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""Snake Bug Quest — compact input recordings and max-speed playback.
+
+Snake always starts from the same layout and Food draws from a seeded RNG,
+so a game is fully described by its starting stage, the seed, the board
+size and the turns pressed before each tick.  A recording stores exactly that:
+
+    b"SBQ" version  varint(stage) varint(seed) varint(ticks)
+                    varint(cols) varint(rows)  event...
+
+Each event is one varint ``(gap << 2) | direction`` where *gap* is the
+number of ticks since the previous turn (0 for several turns within one
+tick).  Idle ticks are thus run-length encoded into the turn that ends
+them and a typical turn costs one or two bytes — a ten-minute game is a
+few hundred bytes.  Version 1 files (no board size) replay on the
+standard board.
+
+    python replay.py FILE...            # re-simulate, print the outcome
+    python replay.py --render FILE...   # same, drawing every tick
+"""
+
+import argparse
+
+from config import GRID_COLS, GRID_ROWS, RANDOM_SEED
+
+MAGIC = b"SBQ"
+VERSION = 2
+NAMES = ("up", "down", "left", "right")
+CODES = {name: code for code, name in enumerate(NAMES)}
+
+
+def _put_varint(buf: bytearray, n: int) -> None:
+    if n < 0:
+        raise ValueError(f"cannot encode negative value {n}")
+    while n >= 0x80:
+        buf.append(n & 0x7F | 0x80)
+        n >>= 7
+    buf.append(n)
+
+
+def _get_varint(data: bytes, pos: int):
+    n = shift = 0
+    while True:
+        if pos >= len(data):
+            raise ValueError("truncated recording")
+        b = data[pos]
+        pos += 1
+        n |= (b & 0x7F) << shift
+        if b < 0x80:
+            return n, pos
+        shift += 7
+
+
+class Recording:
+    """The inputs of one game: starting stage, food seed, board size and
+    timed turns.
+
+    ``events`` holds ``(frame, name)`` pairs in order, *frame* being the
+    number of ticks played when the turn was pressed; ``ticks`` is the
+    length of the game.
+    """
+
+    def __init__(self, stage: int = 1, seed: int = RANDOM_SEED,
+                 events=None, ticks: int = 0,
+                 cols: int = GRID_COLS, rows: int = GRID_ROWS):
+        self.stage = stage
+        self.seed = seed
+        self.events = list(events or ())
+        self.ticks = ticks
+        self.cols, self.rows = cols, rows
+
+    def add(self, frame: int, name: str) -> None:
+        self.events.append((frame, name))
+        self.ticks = max(self.ticks, frame)
+
+    # ── encoding ───────────────────────────────────────────────────
+    def to_bytes(self) -> bytes:
+        buf = bytearray(MAGIC)
+        buf.append(VERSION)
+        for n in (self.stage, self.seed, self.ticks, self.cols, self.rows):
+            _put_varint(buf, n)
+        prev = 0
+        for frame, name in self.events:
+            _put_varint(buf, (frame - prev) << 2 | CODES[name])
+            prev = frame
+        return bytes(buf)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Recording":
+        if data[:3] != MAGIC:
+            raise ValueError("not a Snake Bug Quest recording")
+        version = data[3] if len(data) > 3 else None
+        if version not in (1, VERSION):
+            raise ValueError(f"unsupported recording version {data[3:4]!r}")
+        pos = 4
+        stage, pos = _get_varint(data, pos)
+        seed, pos = _get_varint(data, pos)
+        ticks, pos = _get_varint(data, pos)
+        cols, rows = GRID_COLS, GRID_ROWS
+        if version >= 2:
+            cols, pos = _get_varint(data, pos)
+            rows, pos = _get_varint(data, pos)
+        events, frame = [], 0
+        while pos < len(data):
+            n, pos = _get_varint(data, pos)
+            frame += n >> 2
+            events.append((frame, NAMES[n & 3]))
+        return cls(stage, seed, events, ticks, cols, rows)
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> "Recording":
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+    def __repr__(self):
+        return (f"Recording(stage={self.stage}, seed={self.seed}, "
+                f"board={self.cols}x{self.rows}, "
+                f"turns={len(self.events)}, ticks={self.ticks})")
+
+
+def play(rec: Recording, on_tick=None, engine=None):
+    """Re-simulate *rec* as fast as the CPU allows; returns the final engine.
+
+    *on_tick*, if given, is called with the engine after every tick (e.g.
+    a renderer's ``draw``).  *engine* replaces the default fresh
+    ``Engine(rec.stage, rec.seed)`` on the recorded board, e.g. to replay
+    on another build.
+    """
+    if engine is None:
+        from engine import Engine
+        engine = Engine(stage=rec.stage, seed=rec.seed, cols=rec.cols, rows=rec.rows)
+    events = iter(rec.events)
+    pending = next(events, None)
+    while engine.running and engine.frame < rec.ticks:
+        while pending is not None and pending[0] <= engine.frame:
+            engine.steer(pending[1])
+            pending = next(events, None)
+        engine._tick()
+        if on_tick:
+            on_tick(engine)
+    return engine
+
+
+def _renderer():
+    import pygame
+    from config import WINDOW_WIDTH, WINDOW_HEIGHT
+    from renderer import Renderer
+
+    pygame.init()
+    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    pygame.display.set_caption("Snake Bug Quest — replay")
+    return Renderer(screen, pygame.font.SysFont("monospace", 16),
+                    pygame.font.SysFont("monospace", 28, bold=True))
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Replay Snake Bug Quest recordings")
+    ap.add_argument("files", nargs="+", metavar="FILE")
+    ap.add_argument("--render", action="store_true", help="draw every tick")
+    args = ap.parse_args()
+
+    renderer = _renderer() if args.render else None
+    for path in args.files:
+        rec = Recording.load(path)
+        if renderer:
+            renderer.invalidate()
+        e = play(rec, renderer and renderer.draw)
+        end = ("all fixed" if e.all_fixed else "board full" if e.board_full
+               else "game over" if not e.alive else "stopped")
+        print(f"{path}: stage {rec.stage}→{e.stage} score={e.score} "
+              f"ticks={e.frame} ({end})")
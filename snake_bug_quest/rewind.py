@@ -0,0 +1,110 @@
+"""Snake Bug Quest — rewind: the last few hundred ticks as deltas.
+
+Each tick is stored as what it changed — the head cell pushed, the tail
+cell popped, and the small values the panel shows (score, speed, food,
+direction, ...) as they were before it — in a fixed-size ring, so memory
+stays the same however long the session runs.  Stepping back undoes one
+delta on the live game objects and stepping forward replays it, so
+reaching any buffered frame costs only the ticks in between:
+
+    tl = Timeline()
+    before = tl.state(e); e._tick(); tl.record(e, before)
+    tl.back(e, 10)          # the board as it was 10 ticks ago
+    tl.live(e)              # and back to now
+
+Rewinding is for looking: play resumes from the live state, so call
+``live`` before the next tick.  ``Game`` binds it to the [ and ] keys.
+"""
+
+from config import REWIND_TICKS
+
+# Game attributes a delta restores, besides the body.
+FIELDS = ("frame", "stage", "score", "tick_rate", "alive", "board_full", "all_fixed")
+
+
+class Timeline:
+    """The last *size* ticks of one game, steppable in both directions."""
+
+    def __init__(self, size: int = REWIND_TICKS):
+        self._ring = [None] * size
+        self.count = 0          # ticks recorded since ``clear``
+        self.back_by = 0        # ticks currently undone; 0 = live
+        self._live = None       # state to return to when stepping forward
+
+    def __len__(self):
+        return min(self.count, len(self._ring))
+
+    @property
+    def rewound(self) -> bool:
+        return self.back_by > 0
+
+    def clear(self) -> None:
+        """Forget every tick (a new game started)."""
+        self.count = self.back_by = 0
+        self._live = None
+
+    # ── recording ──────────────────────────────────────────────────
+    @staticmethod
+    def state(g):
+        """The values of *g* a delta restores; take it just before a tick."""
+        snake = g.snake
+        return (tuple(getattr(g, name) for name in FIELDS), g.food.position,
+                snake.direction, snake.pending_growth, snake.length)
+
+    def record(self, g, before) -> None:
+        """Store the tick just played, *before* being ``state(g)`` ahead of it."""
+        snake = g.snake
+        moved = snake.vacated is not None or snake.length != before[4]
+        self._ring[self.count % len(self._ring)] = (
+            snake.head if moved else None, snake.vacated, before[:4])
+        self.count += 1
+
+    # ── stepping ───────────────────────────────────────────────────
+    def back(self, g, n: int = 1) -> int:
+        """Undo up to *n* ticks on *g*; returns how many were undone."""
+        steps = min(n, len(self) - self.back_by)
+        if steps <= 0:
+            return 0
+        if not self.back_by:
+            self._live = self.state(g)[:4]
+        body = g.snake.body
+        for _ in range(steps):
+            self.back_by += 1
+            head, tail, before = self._ring[(self.count - self.back_by) % len(self._ring)]
+            if tail is not None:
+                body.unpop(tail)
+            if head is not None:
+                body.unpush()
+        self._apply(g, before)
+        return steps
+
+    def forward(self, g, n: int = 1) -> int:
+        """Replay up to *n* undone ticks on *g*; returns how many."""
+        steps = min(n, self.back_by)
+        if steps <= 0:
+            return 0
+        body = g.snake.body
+        size = len(self._ring)
+        for _ in range(steps):
+            head, tail, _ = self._ring[(self.count - self.back_by) % size]
+            self.back_by -= 1
+            if head is not None:
+                body.push(head)
+            if tail is not None:
+                body.pop()
+        if self.back_by:
+            self._apply(g, self._ring[(self.count - self.back_by) % size][2])
+        else:
+            self._apply(g, self._live)
+            self._live = None
+        return steps
+
+    def live(self, g) -> None:
+        """Replay everything undone: *g* is back at its latest tick."""
+        self.forward(g, self.back_by)
+
+    @staticmethod
+    def _apply(g, state):
+        values, g.food.position, g.snake.direction, g.snake.pending_growth = state
+        for name, value in zip(FIELDS, values):
+            setattr(g, name, value)
@@ -1,9 +1,14 @@
 """Snake Bug Quest — snake model."""
 
+import time
+from collections import deque
+from itertools import islice
+
 from config import (
-    GRID_COLS, GRID_ROWS, INITIAL_LENGTH, GROWTH_PER_FOOD,
+    GRID_COLS, GRID_ROWS, INITIAL_LENGTH, GROWTH_PER_FOOD, INPUT_BUFFER, BODY_JOURNAL,
     DIR_UP, DIR_DOWN, DIR_LEFT, DIR_RIGHT,
 )
+from board import free_cells
 
 OPPOSITES = {
     DIR_UP: DIR_DOWN,
@@ -13,52 +18,252 @@ OPPOSITES = {
 }
 
 
+class Body:
+    """Ring buffer of cells with an occupancy index.  body[0] is the head.
+
+    Pushing a head and popping the tail are O(1), and so are membership
+    tests and the duplicate-cell check (``overlaps``), whatever the length.
+    If a ``FreeCells`` index is given it is kept in sync as cells are
+    vacated and occupied.
+
+    Pushed cells are also kept newest-first in an immutable cons list
+    (``(cell, older)`` pairs), so ``snapshot`` is O(1) and snapshots share
+    structure with each other and with the live body.  ``restore`` undoes
+    the pushes and pops made since the snapshot (the popped cells are
+    journaled), falling back to rebuilding from the snapshot's list.
+    """
+
+    def __init__(self, cells=(), free=None):
+        self._cells = deque()
+        self._count = {}
+        self._overlaps = 0
+        self.free = free
+        for cell in cells:
+            self._add(cell)
+            self._cells.append(cell)
+        self._pushes = self._pops = 0
+        self._popped = deque(maxlen=BODY_JOURNAL)
+        self._rebase()
+
+    def _add(self, cell):
+        n = self._count.get(cell, 0)
+        if n:
+            self._overlaps += 1
+        elif self.free is not None:
+            self.free.discard(cell)
+        self._count[cell] = n + 1
+
+    def _remove(self, cell):
+        n = self._count[cell]
+        if n > 1:
+            self._count[cell] = n - 1
+            self._overlaps -= 1
+        else:
+            del self._count[cell]
+            if self.free is not None:
+                self.free.add(cell)
+
+    def _rebase(self):
+        """Start a fresh cons list holding just the live cells.
+
+        Run whenever the list gets twice as long as the body, so the cells
+        popped long ago are not kept alive by it.
+        """
+        chain = None
+        for cell in reversed(self._cells):
+            chain = (cell, chain)
+        self._chain = chain
+        self._depth = len(self._cells)
+
+    def push(self, cell):
+        """Add a new head cell."""
+        self._add(cell)
+        self._cells.appendleft(cell)
+        self._chain = (cell, self._chain)
+        self._pushes += 1
+        self._depth += 1
+        if self._depth > 2 * len(self._cells) + BODY_JOURNAL:
+            self._rebase()
+
+    def pop(self):
+        """Remove and return the tail cell."""
+        cell = self._cells.pop()
+        self._remove(cell)
+        self._popped.append(cell)
+        self._pops += 1
+        return cell
+
+    def unpush(self):
+        """Take back the last ``push``; returns the removed head cell."""
+        cell = self._cells.popleft()
+        self._remove(cell)
+        self._chain = self._chain[1]
+        self._pushes -= 1
+        self._depth -= 1
+        return cell
+
+    def unpop(self, cell):
+        """Take back the last ``pop``, which returned *cell*."""
+        self._add(cell)
+        self._cells.append(cell)
+        if self._popped:
+            self._popped.pop()
+        self._pops -= 1
+        if self._depth < len(self._cells):      # popped before the last rebase
+            self._rebase()
+
+    # ── snapshots ──────────────────────────────────────────────────
+    def snapshot(self):
+        """Immutable O(1) token of the current cells, for ``restore``."""
+        return (self._chain, len(self._cells), self._depth, self._pushes, self._pops)
+
+    def restore(self, snap):
+        """Return to the cells of *snap* (from this or another Body)."""
+        chain, length, depth, pushes, pops = snap
+        cells = self._cells
+        undo = self._pushes - pushes
+        redo = self._pops - pops
+        if (0 <= undo <= len(cells) and 0 <= redo <= len(self._popped)
+                and len(cells) - undo + redo == length):
+            node = self._chain
+            for _ in range(undo):
+                node = node[1]
+            if node is chain:
+                for _ in range(undo):
+                    self._remove(cells.popleft())
+                for _ in range(redo):
+                    cell = self._popped.pop()
+                    self._add(cell)
+                    cells.append(cell)
+                self._chain, self._depth = chain, depth
+                self._pushes, self._pops = pushes, pops
+                return
+        # not an ancestor of the live body (or too far back): rebuild
+        if self.free is not None:
+            for cell in self._count:
+                self.free.add(cell)
+        self._cells = deque()
+        self._count = {}
+        self._overlaps = 0
+        node = chain
+        for _ in range(length):
+            cell, node = node
+            self._add(cell)
+            self._cells.append(cell)
+        self._chain, self._depth = chain, depth
+        self._pushes, self._pops = pushes, pops
+        self._popped.clear()
+
+    @property
+    def overlaps(self) -> bool:
+        """True while any cell is occupied more than once."""
+        return self._overlaps > 0
+
+    def count(self, cell) -> int:
+        """How many segments occupy *cell*."""
+        return self._count.get(cell, 0)
+
+    def __contains__(self, cell):
+        return cell in self._count
+
+    def __len__(self):
+        return len(self._cells)
+
+    def __iter__(self):
+        return iter(self._cells)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self._cells))
+            if step == 1:
+                return list(islice(self._cells, start, stop))
+            return list(self._cells)[index]
+        return self._cells[index]
+
+    def __repr__(self):
+        return f"Body({list(self._cells)!r})"
+
+
 class Snake:
     """Grid-based snake.  body[0] is the head."""
 
-    def __init__(self):
+    def __init__(self, cols: int = GRID_COLS, rows: int = GRID_ROWS):
+        self.cols, self.rows = cols, rows
         self.reset()
 
     def reset(self):
-        cx, cy = GRID_COLS // 2, GRID_ROWS // 2
-        self.body = [(cx - i, cy) for i in range(INITIAL_LENGTH)]
+        cx, cy = self.cols // 2, self.rows // 2
+        self.body = Body(((cx - i, cy) for i in range(INITIAL_LENGTH)),
+                         free=free_cells(self.cols, self.rows))
         self.direction = DIR_RIGHT
         self.pending_growth = 0
-        self._next_dir = DIR_RIGHT
+        self.vacated = None
+        self.input_lag = None
+        self._turns = deque()
 
     # ── direction ──────────────────────────────────────────────────
-    def set_direction(self, new_dir):
-        """Queue direction; rejects 180° reversal."""
-        if new_dir == OPPOSITES.get(self.direction):
-            return
-        self._next_dir = new_dir
+    def set_direction(self, new_dir, stamp=None):
+        """Queue a turn; rejects 180° reversal of the last queued direction.
+
+        Up to INPUT_BUFFER turns wait in order, one applied per update, so
+        quick key sequences within a tick are not lost.  *stamp* is the
+        ``time.perf_counter()`` of the key press (defaults to now).
+        Returns True if the turn was queued.
+        """
+        last = self._turns[-1][0] if self._turns else self.direction
+        if new_dir == last or new_dir == OPPOSITES.get(last):
+            return False
+        if len(self._turns) >= INPUT_BUFFER:
+            return False
+        self._turns.append((new_dir, time.perf_counter() if stamp is None else stamp))
+        return True
 
     # ── tick ───────────────────────────────────────────────────────
     def update(self):
-        """Advance one step.  Returns True if alive."""
-        self.direction = self._next_dir
+        """Advance one step.  Returns True if alive.
+
+        ``vacated`` is set to the tail cell given up this step (None if
+        the snake grew instead); ``input_lag`` to the seconds between the
+        key press and this tick when a queued turn was applied.
+        """
+        self.vacated = None
+        self.input_lag = None
+        if self._turns:
+            self.direction, stamp = self._turns.popleft()
+            self.input_lag = time.perf_counter() - stamp
         dx, dy = self.direction
         hx, hy = self.body[0]
         new_head = (hx + dx, hy + dy)
 
         # Boundary check
         nx, ny = new_head
-        if nx < 0 or nx >= GRID_COLS or ny < 0 or ny >= GRID_COLS:
+        if nx < 0 or nx >= self.cols or ny < 0 or ny >= self.cols:
             return False
 
         # Self-collision: detect any duplicate cell in the body
-        if len(self.body) != len(set(self.body)):
+        if self.body.overlaps:
             return False
 
-        self.body.insert(0, new_head)
+        self.body.push(new_head)
 
         if self.pending_growth > 0:
             self.pending_growth -= 1
         else:
-            self.body.pop()
+            self.vacated = self.body.pop()
 
         return True
 
+    # ── snapshots ──────────────────────────────────────────────────
+    def snapshot(self):
+        """Immutable state for ``restore``; the body is shared, not copied."""
+        return (self.body.snapshot(), self.direction, self.pending_growth,
+                self.vacated, self.input_lag, tuple(self._turns))
+
+    def restore(self, snap):
+        body, self.direction, self.pending_growth, self.vacated, self.input_lag, turns = snap
+        self.body.restore(body)
+        self._turns = deque(turns)
+
     # ── helpers ────────────────────────────────────────────────────
     @property
     def head(self):